@@ -4,6 +4,10 @@ import json
 import os
 import logging
 from rosmap.loaders.module_loader import ModuleLoader
+from rosmap.canonicalizers.repository_url_canonicalizer import RepositoryUrlCanonicalizer
+from rosmap.dependency_analysis.dependency_graph import DependencyGraph
+from rosmap.dependency_analysis.package_provider_index import PackageProviderIndex
+from rosmap.repository_parsers.rosdistro_repo_parser import RosdistroRepositoryParser
 from shutil import copy
 
 PROGRAM_DESCRIPTION = ""
@@ -21,7 +25,7 @@ def load_cloners(settings: dict) -> dict:
     cloners = dict()
     for cloner in ModuleLoader.load_modules(os.path.dirname(os.path.realpath(__file__)),
                                             "repository_cloners",
-                                            ["IRepositoryCloner"],
+                                            ["IRepositoryCloner", "AbstractRepositoryCloner"],
                                             "RepositoryCloner",
                                             settings):
         cloners[cloner.clones()] = cloner
@@ -36,21 +40,23 @@ def load_package_analyzers(settings: dict) -> list:
                                               settings)
 
 
-def load_file_analyzers() -> list:
+def load_file_analyzers(settings: dict) -> list:
     return ModuleLoader.load_modules(os.path.dirname(os.path.realpath(__file__)),
                                  "file_analyzers",
                                  ["IFileAnalyzer"],
-                                 "FileAnalyzer")
+                                 "FileAnalyzer",
+                                 settings)
 
 
 def load_analyzers(settings: dict) -> dict:
     analyzers = dict()
     for analyzer in ModuleLoader.load_modules(os.path.dirname(os.path.realpath(__file__)),
-                                              "rosmap/repository_analyzers/offline",
+                                              "repository_analyzers/offline",
                                               ["IRepositoryAnalyzer", "AbstractRepositoryAnalyzer"],
                                               "RepositoryAnalyzer",
+                                              settings,
                                               load_package_analyzers(settings),
-                                              load_file_analyzers()):
+                                              load_file_analyzers(settings)):
         analyzers[analyzer.analyzes()] = analyzer
     return analyzers
 
@@ -58,7 +64,7 @@ def load_analyzers(settings: dict) -> dict:
 def load_remote_analyzers(settings: dict) -> dict:
     remote_analyzers = dict()
     for analyzer in ModuleLoader.load_modules(os.path.dirname(os.path.realpath(__file__)),
-                                              "rosmap/repository_analyzers/online",
+                                              "repository_analyzers/online",
                                               ["ISCSRepositoryAnalyzer"],
                                               "RepositoryAnalyzer",
                                               settings):
@@ -80,6 +86,8 @@ def main():
     parser.add_argument("--skip_download", "-d", help="Use this flag to skip downloading of repositories to your workspace.", default=False, action="store_true")
     parser.add_argument("--output", "-o", help="Add a path to the output file for the analysis. If this path is not defined, analysis will not be performed. ", default="")
     parser.add_argument("--generate_config", help="Generates a config file on the given path.")
+    parser.add_argument("--dependency_graph", help="Add a path to an output file for per-package statistics of the dependency graph of all analyzed repositories (requires --output).", default="")
+    parser.add_argument("--jobs", "-j", help="Number of repositories that are analyzed in parallel.", type=int, default=1)
 
     # Parse arguments
     arguments = parser.parse_args()
@@ -104,12 +112,15 @@ def main():
     # Expand home directories.
     settings["analysis_workspace"] = os.path.expanduser(settings["analysis_workspace"])
     settings["rosdistro_workspace"] = os.path.expanduser(settings["rosdistro_workspace"])
+    settings["analysis_jobs"] = arguments.jobs
 
     # Initialize dictionaries.
     repositories = dict()
     for vcs in settings["version_control_systems"]:
         repositories[vcs] = set()
 
+    canonicalizer = RepositoryUrlCanonicalizer(settings)
+
     if not arguments.load_existing:
         # Parse repositories
         logging.info("[Parser]: Parsing repositories...")
@@ -117,6 +128,10 @@ def main():
         for parser in parsers:
             parser.parse_repositories(repositories)
 
+        # Make sure every repository is only cloned and analyzed once.
+        canonicalizer.canonicalize_repositories(repositories)
+        canonicalizer.save_aliases()
+
         # Create folder
         if not os.path.exists(settings["analysis_workspace"]):
             os.makedirs(settings["analysis_workspace"]+"links/")
@@ -133,6 +148,8 @@ def main():
             with open(settings["analysis_workspace"]+"links/" + vcs, "r") as output_file:
                 for line in output_file:
                     repositories[vcs].add(line.rstrip("\r\n"))
+        canonicalizer.load_aliases()
+        canonicalizer.canonicalize_repositories(repositories)
 
     if not arguments.skip_download:
         cloners = load_cloners(settings)
@@ -150,13 +167,27 @@ def main():
         repo_details = dict()
         for vcs in settings["version_control_systems"]:
             if vcs in analyzers:
+                vcs_details = dict()
                 analyzers[vcs].analyze_repositories(settings["analysis_workspace"] + settings["repository_folder"] + vcs,
-                                                    repo_details)
+                                                    vcs_details)
+                canonicalizer.canonicalize_details(vcs, vcs_details, repo_details)
             else:
                 logging.warning("Cannot analyze repositories of type " + vcs + ": No analyzer found for this type...")
 
+        canonicalizer.add_aliases(repo_details)
+
+        # Resolve dependencies to the repositories providing them.
+        provider_index = PackageProviderIndex(canonicalizer)
+        provider_index.add_rosdistro_providers(RosdistroRepositoryParser(settings).parse_package_providers(),
+                                               repo_details)
+        provider_index.add_analyzed_providers(repo_details)
+        provider_index.add_dependency_providers(repo_details)
         write_to_file(arguments.output, repo_details)
 
+        if not arguments.dependency_graph == "":
+            logging.info("[DependencyGraph]: Writing dependency graph statistics...")
+            DependencyGraph(repo_details).write_to_file(arguments.dependency_graph)
+
         remote_analyzers = load_remote_analyzers(settings)
         for scs in settings["social_coding_sites"]:
             if scs in remote_analyzers:
@@ -1,16 +1,26 @@
 import json
 import logging
-import time
-import certifi
 import urllib3
+from .http_session import HttpSession
+from .rate_limiter import RateLimiter
+
+DEFAULT_API_URL = 'https://api.bitbucket.org/2.0'
 
 
 class BitbucketApiBindings:
     """
     Wraps Bitbucket API functions.
     """
-    def __init__(self, rate_limit: int):
-        self.__rate_limit = rate_limit
+    def __init__(self, rate_limit: int, http_session: HttpSession, api_url: str = DEFAULT_API_URL):
+        """
+        Creates a new instance of the BitbucketApiBindings class.
+        :param rate_limit: Bitbucket API rate limit (requests per hour)
+        :param http_session: HTTP session used for all requests.
+        :param api_url: Base URL of the Bitbucket API (without trailing slash).
+        """
+        self.__api_url = api_url.rstrip("/")
+        self.__rate_limiter = RateLimiter(rate_limit)
+        self.__http_session = http_session
 
     def form_bitbucket_request(self, url: str) -> urllib3.response:
         """
@@ -18,10 +28,10 @@ class BitbucketApiBindings:
         :param url: The url to call.
         :return: The response resulting from the request.
         """
-        time.sleep(3600/self.__rate_limit)
-        http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
-        return http.request('GET',
-                            url)
+        return self.__http_session.request('GET',
+                                           url,
+                                           headers=urllib3.util.make_headers(keep_alive=True),
+                                           rate_limiter=self.__rate_limiter)
 
     def get_repo_substring(self, url, provider):
         """
@@ -44,7 +54,7 @@ class BitbucketApiBindings:
         """
         project_string = self.get_repo_substring(repo_url, "https://bitbucket.org/")
         response = self.form_bitbucket_request(
-            "https://api.bitbucket.org/2.0/repositories/" + project_string + "/watchers")
+            self.__api_url + "/repositories/" + project_string + "/watchers")
         if response.status == 200:
             data = response.data
             decoded = json.loads(data.decode('utf-8'))
@@ -69,7 +79,7 @@ class BitbucketApiBindings:
         :return: API URL for retrieving an issue list.
         """
         project_string = self.get_repo_substring(repo_url, "https://bitbucket.org/")
-        return "https://api.bitbucket.org/2.0/repositories/" + project_string + "/issues"
+        return self.__api_url + "/repositories/" + project_string + "/issues"
 
     def get_pull_requests_api_string(self, repo_uri):
         """
@@ -78,7 +88,7 @@ class BitbucketApiBindings:
         :return: API URL for retrieving pull request list.
         """
         project_string = self.get_repo_substring(repo_uri, "https://bitbucket.org/")
-        return "https://api.bitbucket.org/2.0/repositories/" + project_string + "/pullrequests?state=OPEN"
+        return self.__api_url + "/repositories/" + project_string + "/pullrequests?state=OPEN"
 
     def get_values(self, api_url) -> iter:
         """
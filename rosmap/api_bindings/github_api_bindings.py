@@ -1,28 +1,58 @@
 import json
 import logging
-import time
-import certifi
 
 import urllib3
+from .http_session import HttpSession
+from .rate_limiter import RateLimiter
 
 PAGE_SIZE = 100
-TOPIC_SEARCH_URL = 'https://api.github.com/search/repositories?q=topic%3A'
+DEFAULT_API_URL = 'https://api.github.com'
+TOPIC_SEARCH_PATH = '/search/repositories?q=topic%3A'
+GRAPHQL_PATH = '/graphql'
+
+# Statistics of a single repository, queried for many repositories at once using aliases.
+GRAPHQL_STATISTICS_FIELDS = """
+    url
+    stargazerCount
+    openIssues: issues(states: OPEN) { totalCount }
+    closedIssues: issues(states: CLOSED) { totalCount }
+    openPullRequests: pullRequests(states: OPEN) { totalCount }
+    closedPullRequests: pullRequests(states: [CLOSED, MERGED]) { totalCount }
+"""
+
+GRAPHQL_CLOSED_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(states: CLOSED, first: """ + str(PAGE_SIZE) + """, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { createdAt closedAt }
+    }
+  }
+}
+"""
 
 
 class GithubApiBindings:
     """
     Wraps GitHub API functions.
     """
-    def __init__(self, username: str, password: str, rate_limit: float):
+    def __init__(self, username: str, password: str, rate_limit: float, http_session: HttpSession,
+                 api_url: str = DEFAULT_API_URL):
         """
         Creates a new instance of the GithubApiBindings Class.
         :param username: Username to log into GitHub
         :param password: Password to log into GitHub
         :param rate_limit: GitHub API rate limit (requests per hour)
+        :param http_session: HTTP session used for all requests.
+        :param api_url: Base URL of the GitHub API (without trailing slash).
         """
+        self.__api_url = api_url.rstrip("/")
         self.__username = username
         self.__password = password
-        self.__rate_limit = rate_limit
+        self.__rate_limiter = RateLimiter(rate_limit)
+        # GraphQL requests are limited separately.
+        self.__graphql_rate_limiter = RateLimiter(rate_limit)
+        self.__http_session = http_session
 
     def __form_github_request(self, url: str) -> urllib3.response:
         """
@@ -30,12 +60,36 @@ class GithubApiBindings:
         :param url: Request URL
         :return: Response
         """
-        time.sleep(3600/self.__rate_limit)
-        http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED', ca_certs=certifi.where())
-        return http.request('GET',
-                            url,
-                            headers=urllib3.util.make_headers(basic_auth=self.__username + ":" + self.__password,
-                                                              user_agent=self.__username))
+        return self.__http_session.request('GET',
+                                           url,
+                                           headers=urllib3.util.make_headers(
+                                               basic_auth=self.__username + ":" + self.__password,
+                                               user_agent=self.__username,
+                                               keep_alive=True),
+                                           rate_limiter=self.__rate_limiter)
+
+    def __form_graphql_request(self, query: str, variables: dict) -> dict:
+        """
+        Sends a query to the GitHub GraphQL API (requires an API token as password).
+        :param query: The GraphQL query.
+        :param variables: Variables of the query.
+        :return: the data of the response as dict, None if the request failed.
+        """
+        headers = urllib3.util.make_headers(user_agent=self.__username, keep_alive=True)
+        headers["Authorization"] = "bearer " + self.__password
+        headers["Content-Type"] = "application/json"
+        response = self.__http_session.request('POST',
+                                               self.__api_url + GRAPHQL_PATH,
+                                               headers=headers,
+                                               body=json.dumps({"query": query, "variables": variables}).encode('utf-8'),
+                                               rate_limiter=self.__graphql_rate_limiter)
+        if response.status != 200:
+            logging.warning("[Github API Connector]: GraphQL response returned " + str(response.status))
+            return None
+        result = json.loads(response.data.decode('utf-8'))
+        for error in result.get("errors", list()):
+            logging.info("[Github API Connector]: GraphQL error: " + str(error.get("message")))
+        return result.get("data")
 
     def __get_page(self, topic: str, pagesize: int, page: int, ascending: bool) -> dict:
         """
@@ -46,7 +100,7 @@ class GithubApiBindings:
         :param ascending: sort ascending (true) or descending (false)
         :return: deserialized json string as dict.
         """
-        url = TOPIC_SEARCH_URL + topic + '&per_page=' + str(pagesize) + '&page=' + str(page)
+        url = self.__api_url + TOPIC_SEARCH_PATH + topic + '&per_page=' + str(pagesize) + '&page=' + str(page)
         if ascending:
             response = self.__form_github_request(url + "&sort=stars&order=asc")
         else:
@@ -142,7 +196,7 @@ class GithubApiBindings:
         """
 
         project_string = self.__get_repo_substring(url, "https://github.com/")
-        next_uri = "https://api.github.com/repos/" + project_string + "/issues?state=" + issue_state
+        next_uri = self.__api_url + "/repos/" + project_string + "/issues?state=" + issue_state
         while next_uri != "":
             response = self.__form_github_request(next_uri)
             if response.status != 200:
@@ -150,22 +204,93 @@ class GithubApiBindings:
                 logging.warning("[Github API Connector]: Response returned " + str(response.status))
             else:
                 data = response.data
-                issues = json.loads(data.decode(response))
+                issues = json.loads(data.decode('utf-8'))
                 for issue in issues:
                     yield issue
                 next_uri = self.__extract_next_url_from_header(response.headers)
 
-    def get_stargazer_count(self, url: str) -> int:
+    def get_repository(self, url: str) -> dict:
         """
-        Returns the stargazer count for a repository.
+        Returns the GitHub API representation of a repository, moved repositories are followed to their new location.
         :param url: URL to the repository.
-        :return: stargazer count for the repository. (-1 if request failed.)
+        :return: deserialized repository as dict. (None if request failed.)
         """
         project_string = self.__get_repo_substring(url, "https://github.com/")
-        response = self.__form_github_request("https://api.github.com/repos/" + project_string)
+        response = self.__form_github_request(self.__api_url + "/repos/" + project_string)
         if response.status == 200:
             data = response.data
-            return json.loads(data.decode('utf-8'))["stargazers_count"]
+            return json.loads(data.decode('utf-8'))
+        return None
+
+    def get_repository_statistics(self, urls: list) -> dict:
+        """
+        Returns stars, open issues, closed issues, open pull requests and closed pull requests of many repositories
+        using a single GraphQL query.
+        :param urls: URLs to the repositories.
+        :return: dictionary with URL as key and a dict with keys url (current URL of the repository), stars,
+        open_issues, closed_issues, open_pull_requests and closed_pull_requests as value (None if the repository
+        could not be found). Empty dictionary if the request failed.
+        """
+        variables = dict()
+        declarations = list()
+        fields = list()
+        for index, url in enumerate(urls):
+            owner, name = self.__get_repo_substring(url, "https://github.com/").split("/")[:2]
+            variables["owner" + str(index)] = owner
+            variables["name" + str(index)] = name
+            declarations.append("$owner" + str(index) + ": String!, $name" + str(index) + ": String!")
+            fields.append("r" + str(index) + ": repository(owner: $owner" + str(index) + ", name: $name"
+                          + str(index) + ") {" + GRAPHQL_STATISTICS_FIELDS + "}")
+        query = "query(" + ", ".join(declarations) + ") {\n" + "\n".join(fields) + "\n}"
+
+        data = self.__form_graphql_request(query, variables)
+        if data is None:
+            return dict()
+
+        statistics = dict()
+        for index, url in enumerate(urls):
+            repository = data.get("r" + str(index))
+            if repository is None:
+                statistics[url] = None
+                continue
+            statistics[url] = {"url": repository["url"],
+                               "stars": repository["stargazerCount"],
+                               "open_issues": repository["openIssues"]["totalCount"],
+                               "closed_issues": repository["closedIssues"]["totalCount"],
+                               "open_pull_requests": repository["openPullRequests"]["totalCount"],
+                               "closed_pull_requests": repository["closedPullRequests"]["totalCount"]}
+        return statistics
+
+    def get_closed_issues_graphql(self, url: str) -> iter:
+        """
+        Yield returns creation and closing timestamps of all closed issues (excluding pull requests), using the
+        GraphQL API.
+        :param url: The url to the repository to get issues from.
+        :return: Yield returns dicts with keys created_at and closed_at.
+        """
+        owner, name = self.__get_repo_substring(url, "https://github.com/").split("/")[:2]
+        cursor = None
+        while True:
+            data = self.__form_graphql_request(GRAPHQL_CLOSED_ISSUES_QUERY,
+                                               {"owner": owner, "name": name, "cursor": cursor})
+            if data is None or data.get("repository") is None:
+                return
+            issues = data["repository"]["issues"]
+            for issue in issues["nodes"]:
+                yield {"created_at": issue["createdAt"], "closed_at": issue["closedAt"]}
+            if not issues["pageInfo"]["hasNextPage"]:
+                return
+            cursor = issues["pageInfo"]["endCursor"]
+
+    def get_stargazer_count(self, url: str) -> int:
+        """
+        Returns the stargazer count for a repository.
+        :param url: URL to the repository.
+        :return: stargazer count for the repository. (-1 if request failed.)
+        """
+        repository = self.get_repository(url)
+        if repository is not None:
+            return repository["stargazers_count"]
         return -1
 
     def is_pull_request(self, issue: dict):
@@ -0,0 +1,148 @@
+from .rate_limiter import RateLimiter
+from .response_cache import ResponseCache
+import threading
+import logging
+import certifi
+import urllib3
+# Only exported by the package itself since urllib3 2.0.
+from urllib3._collections import HTTPHeaderDict
+
+DEFAULT_HTTP_TIMEOUT = 30
+DEFAULT_HTTP_RETRIES = 3
+DEFAULT_HTTP_POOL_SIZE = 10
+DEFAULT_HTTP_CACHE = False
+
+# Headers of a 304 response that do not describe the cached content.
+NOT_MODIFIED_EXCLUDED_HEADERS = ["content-length", "content-type", "transfer-encoding", "content-encoding"]
+
+# Server errors that are retried with exponential backoff.
+RETRY_STATUS_CODES = [500, 502, 503, 504]
+RETRY_BACKOFF_FACTOR = 0.5
+
+# Requests rejected by the rate limit of an API are sent again after waiting.
+MAX_RATE_LIMITED_ATTEMPTS = 5
+
+
+class HttpSession(object):
+    """
+    Long-lived HTTP client shared by all API bindings, keeps connections to each host alive in a pool and verifies
+    certificates against the certifi bundle, which is only loaded once.
+    """
+    __shared = None
+    __shared_lock = threading.Lock()
+
+    def __init__(self, settings: dict):
+        """
+        Creates a new instance of the HttpSession class.
+        :param settings: settings containing http_timeout (seconds for connecting and for reading), http_retries
+        (amount of retries after connection errors and server errors), http_pool_size (connections kept alive per
+        host), http_cache (send conditional requests and serve unchanged responses from a cache) and
+        analysis_workspace (the cache is stored in its cache/ subfolder).
+        """
+        timeout = float(settings.get("http_timeout", DEFAULT_HTTP_TIMEOUT))
+        retries = urllib3.util.Retry(total=int(settings.get("http_retries", DEFAULT_HTTP_RETRIES)),
+                                     backoff_factor=RETRY_BACKOFF_FACTOR,
+                                     status_forcelist=RETRY_STATUS_CODES,
+                                     raise_on_status=False)
+        self.__pool_manager = urllib3.PoolManager(maxsize=int(settings.get("http_pool_size", DEFAULT_HTTP_POOL_SIZE)),
+                                                  cert_reqs='CERT_REQUIRED',
+                                                  ca_certs=certifi.where(),
+                                                  timeout=urllib3.util.Timeout(connect=timeout, read=timeout),
+                                                  retries=retries)
+        self.__cache = None
+        if settings.get("http_cache", DEFAULT_HTTP_CACHE):
+            self.__cache = ResponseCache(settings["analysis_workspace"] + "cache/http.sqlite")
+
+    @staticmethod
+    def shared(settings: dict) -> "HttpSession":
+        """
+        Returns the session shared by all API bindings of this process, creates it on first use.
+        :param settings: settings used to create the session (see constructor).
+        :return: The shared session.
+        """
+        with HttpSession.__shared_lock:
+            if HttpSession.__shared is None:
+                HttpSession.__shared = HttpSession(settings)
+            return HttpSession.__shared
+
+    def request(self, method: str, url: str, headers: dict = None, body: bytes = None, timeout: float = None,
+                rate_limiter: RateLimiter = None, cacheable: bool = True) -> urllib3.response.HTTPResponse:
+        """
+        Sends a request using a pooled connection.
+        :param method: HTTP method (e.g. "GET").
+        :param url: Request URL.
+        :param headers: Request headers.
+        :param body: Request body.
+        :param timeout: Timeout in seconds for this request, the session's timeout if None.
+        :param rate_limiter: Rate limiter of the API, the request is sent again if it has been rate limited.
+        :param cacheable: False if the response must not be cached (e.g. probes of non-API servers).
+        :return: The response, its content has been read completely.
+        :raises urllib3.exceptions.HTTPError: if the request failed after all retries.
+        """
+        arguments = dict()
+        if timeout is not None:
+            arguments["timeout"] = timeout
+        if self.__cache is not None and cacheable and method == 'GET':
+            return self.__conditional_request(url, headers, arguments, rate_limiter)
+        return self.__send(method, url, headers, body, arguments, rate_limiter)
+
+    def __conditional_request(self, url: str, headers: dict, arguments: dict,
+                              rate_limiter: RateLimiter) -> urllib3.response.HTTPResponse:
+        """
+        Sends a conditional GET request if a response is cached, and serves the cached response if the resource has
+        not been modified.
+        :param url: Request URL.
+        :param headers: Request headers.
+        :param arguments: Additional arguments for the pool manager (e.g. timeout).
+        :param rate_limiter: Rate limiter of the API.
+        :return: The response.
+        """
+        key = ResponseCache.key(url, headers)
+        cached = self.__cache.get(key)
+        request_headers = dict(headers or dict())
+        if cached is not None:
+            if cached["etag"] is not None:
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"] is not None:
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self.__send('GET', url, request_headers, None, arguments, rate_limiter)
+        if response.status == 304 and cached is not None:
+            # Keep the cached headers (e.g. pagination links), take everything else from the new response.
+            response_headers = HTTPHeaderDict(cached["headers"])
+            for name, value in response.headers.items():
+                if name.lower() not in NOT_MODIFIED_EXCLUDED_HEADERS:
+                    response_headers[name] = value
+            return urllib3.response.HTTPResponse(body=cached["body"], headers=response_headers,
+                                                 status=cached["status"])
+        if response.status == 200:
+            self.__cache.put(key, response.status, response.headers, response.data)
+        return response
+
+    def __send(self, method: str, url: str, headers: dict, body: bytes, arguments: dict,
+               rate_limiter: RateLimiter) -> urllib3.response.HTTPResponse:
+        """
+        Sends a request, waits for the rate limiter and retries rate limited requests if a rate limiter is given.
+        :param method: HTTP method (e.g. "GET").
+        :param url: Request URL.
+        :param headers: Request headers.
+        :param body: Request body.
+        :param arguments: Additional arguments for the pool manager (e.g. timeout).
+        :param rate_limiter: Rate limiter of the API, may be None.
+        :return: The response.
+        """
+        if rate_limiter is None:
+            return self.__pool_manager.request(method, url, headers=headers, body=body, **arguments)
+
+        for attempt in range(MAX_RATE_LIMITED_ATTEMPTS):
+            rate_limiter.acquire()
+            try:
+                response = self.__pool_manager.request(method, url, headers=headers, body=body, **arguments)
+            except urllib3.exceptions.HTTPError:
+                rate_limiter.release(None)
+                raise
+            rate_limiter.release(response.headers)
+            if not RateLimiter.is_rate_limited(response.status, response.headers):
+                break
+            logging.info("[HttpSession]: " + url + " has been rate limited, retrying...")
+        return response
@@ -0,0 +1,119 @@
+import threading
+import time
+import email.utils
+import logging
+
+# Amount of requests that can be sent at once when the server does not report its rate limit, in minutes of quota.
+BURST_MINUTES = 1
+
+# Seconds to wait if the server sends a Retry-After header that can not be parsed.
+DEFAULT_RETRY_AFTER = 60
+
+
+class RateLimiter(object):
+    """
+    Token bucket that paces requests to an API. The bucket allows bursts while quota remains and refills at the
+    configured rate; rate limit headers of responses (X-RateLimit-Remaining, X-RateLimit-Reset, Retry-After) replace
+    the estimate with the quota actually remaining, so requests only wait once the quota is exhausted.
+    """
+
+    def __init__(self, rate_limit: float):
+        """
+        Creates a new instance of the RateLimiter class.
+        :param rate_limit: Allowed requests per hour.
+        """
+        self.__rate = rate_limit / 3600.0
+        self.__capacity = max(1.0, rate_limit / 60.0 * BURST_MINUTES)
+        self.__tokens = self.__capacity
+        self.__updated = time.time()
+        self.__not_before = 0.0
+        self.__in_flight = 0
+        self.__lock = threading.Lock()
+
+    def __refill(self, now: float) -> None:
+        """
+        Adds the tokens that accumulated since the last refill, tokens granted by the server are not capped.
+        :param now: Current time.
+        :return: None
+        """
+        if self.__tokens < self.__capacity:
+            self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated) * self.__rate)
+        self.__updated = now
+
+    def acquire(self) -> None:
+        """
+        Blocks until a request may be sent, every acquire has to be followed by release.
+        :return: None
+        """
+        while True:
+            with self.__lock:
+                now = time.time()
+                self.__refill(now)
+                if now < self.__not_before:
+                    delay = self.__not_before - now
+                elif self.__tokens >= 1:
+                    self.__tokens -= 1
+                    self.__in_flight += 1
+                    return
+                else:
+                    delay = (1 - self.__tokens) / self.__rate
+            time.sleep(delay)
+
+    def release(self, headers: dict) -> None:
+        """
+        Updates the bucket from the rate limit headers of a response.
+        :param headers: Headers of the response, None if the request failed.
+        :return: None
+        """
+        with self.__lock:
+            self.__in_flight -= 1
+            if headers is None:
+                return
+            now = time.time()
+            self.__refill(now)
+
+            if headers.get("X-RateLimit-Remaining") is not None:
+                try:
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                    reset = float(headers.get("X-RateLimit-Reset", now))
+                except ValueError:
+                    remaining = None
+                if remaining is not None:
+                    # Requests still in flight will consume quota as well.
+                    self.__tokens = max(0, remaining - self.__in_flight)
+                    if remaining == 0 and reset > now:
+                        logging.info("[RateLimiter]: Quota exhausted, waiting " + str(int(reset - now))
+                                     + " seconds for reset.")
+                        self.__not_before = max(self.__not_before, reset)
+
+            if headers.get("Retry-After") is not None:
+                self.__not_before = max(self.__not_before, now + self.__parse_retry_after(headers["Retry-After"], now))
+
+    @staticmethod
+    def __parse_retry_after(value: str, now: float) -> float:
+        """
+        Parses a Retry-After header, which contains either seconds or a HTTP date.
+        :param value: The header value.
+        :param now: Current time.
+        :return: Seconds to wait.
+        """
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - now)
+            except (TypeError, ValueError):
+                return float(DEFAULT_RETRY_AFTER)
+
+    @staticmethod
+    def is_rate_limited(status: int, headers: dict) -> bool:
+        """
+        Checks whether a response has been rejected because of the rate limit (and should be retried).
+        :param status: Status of the response.
+        :param headers: Headers of the response.
+        :return: True if the request has been rate limited, False otherwise.
+        """
+        if status == 429:
+            return True
+        return status == 403 and (headers.get("Retry-After") is not None
+                                  or headers.get("X-RateLimit-Remaining") == "0")
@@ -0,0 +1,68 @@
+import threading
+import hashlib
+import sqlite3
+import json
+import os
+
+
+class ResponseCache(object):
+    """
+    Persistent cache of API responses that carry an ETag or Last-Modified header, used to send conditional requests:
+    unchanged resources are answered with 304 Not Modified and served from the cache.
+    """
+
+    def __init__(self, path: str):
+        """
+        Creates a new instance of the ResponseCache class.
+        :param path: Path to the cache database.
+        """
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        # The cache is shared by all threads of the HTTP session.
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS responses "
+                                      "(key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, status INTEGER, "
+                                      "headers TEXT, body BLOB)")
+
+    @staticmethod
+    def key(url: str, headers: dict) -> str:
+        """
+        Returns the cache key of a request, responses for different credentials are cached separately.
+        :param url: Request URL.
+        :param headers: Request headers.
+        :return: The cache key.
+        """
+        authorization = (headers or dict()).get("authorization", (headers or dict()).get("Authorization", ""))
+        return hashlib.sha1((url + "\0" + authorization).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict:
+        """
+        Looks up a cached response.
+        :param key: The cache key of the request.
+        :return: dictionary with keys etag, last_modified, status, headers and body; None if nothing is cached.
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT etag, last_modified, status, headers, body FROM responses "
+                                            "WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "status": row[2], "headers": json.loads(row[3]),
+                "body": bytes(row[4])}
+
+    def put(self, key: str, status: int, headers: dict, body: bytes) -> None:
+        """
+        Caches a response if it can be validated later on (i.e. has an ETag or Last-Modified header).
+        :param key: The cache key of the request.
+        :param status: Status of the response.
+        :param headers: Headers of the response.
+        :param body: Body of the response.
+        :return: None
+        """
+        if headers.get("ETag") is None and headers.get("Last-Modified") is None:
+            return
+        with self.__lock, self.__connection:
+            self.__connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                                      (key, headers.get("ETag"), headers.get("Last-Modified"), status,
+                                       json.dumps(dict(headers)), sqlite3.Binary(body)))
@@ -0,0 +1,225 @@
+from urllib.parse import urlsplit
+import json
+import os
+import re
+import logging
+
+# Matches scp-like git URLs (e.g. git@github.com:ros/ros_comm.git).
+REGEX_SCP_URL = '^(?:[^@/]+@)?([^:/]+):(?!//)(.+)$'
+REGEX_SCP_HOST_GROUP = 1
+REGEX_SCP_PATH_GROUP = 2
+
+# Hosts that treat user- and repository-names case insensitively.
+CASE_INSENSITIVE_HOSTS = ["github.com", "bitbucket.org", "gitlab.com"]
+
+# Hosts that always serve repositories via https.
+HTTPS_HOSTS = ["github.com", "bitbucket.org", "gitlab.com"]
+
+DEFAULT_PORTS = {"http": 80, "https": 443, "ssh": 22, "git": 9418, "svn": 3690}
+
+MAX_REDIRECT_HOPS = 10
+
+
+class RepositoryUrlCanonicalizer(object):
+    """
+    Maps different spellings of repository URLs (scheme, host case, .git suffix, trailing slashes, redirects) to one
+    canonical URL per repository, and keeps track of the aliases of each canonical URL.
+    """
+
+    def __init__(self, settings: dict):
+        """
+        Creates a new instance of the RepositoryUrlCanonicalizer class.
+        :param settings: settings including key analysis_workspace (path); redirects and aliases are stored in its
+        links/ subfolder.
+        """
+        self.__links_directory = settings["analysis_workspace"] + "links/"
+        self.__aliases = dict()
+        self.__representatives = dict()
+        self.__redirects = self.__load_json(self.__links_directory + "redirects.json")
+
+    @staticmethod
+    def __load_json(path: str) -> dict:
+        """
+        Loads a json dictionary from a file.
+        :param path: Path to the file.
+        :return: The loaded dictionary, or an empty dictionary if the file does not exist.
+        """
+        if not os.path.exists(path):
+            return dict()
+        with open(path, "r") as input_file:
+            return json.loads(input_file.read())
+
+    def __write_json(self, name: str, content: dict) -> None:
+        """
+        Writes a json dictionary to a file in the links-folder.
+        :param name: Name of the file.
+        :param content: Dictionary to write.
+        :return: None
+        """
+        if not os.path.exists(self.__links_directory):
+            os.makedirs(self.__links_directory)
+        with open(self.__links_directory + name, "w") as output_file:
+            output_file.write(json.dumps(content, indent=2, sort_keys=True))
+
+    @staticmethod
+    def __split(url: str) -> tuple:
+        """
+        Splits a repository URL into its normalized scheme, host (including non-default port) and path.
+        :param url: The URL to split.
+        :return: (scheme, host, path), path does not contain trailing slashes or the .git suffix.
+        """
+        url = url.strip()
+        regex_result = re.search(REGEX_SCP_URL, url)
+        if "://" not in url and regex_result is not None:
+            scheme = "ssh"
+            host = regex_result.group(REGEX_SCP_HOST_GROUP).lower()
+            path = "/" + regex_result.group(REGEX_SCP_PATH_GROUP).lstrip("/")
+        else:
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            host = (parts.hostname or "").lower()
+            try:
+                port = parts.port
+            except ValueError:
+                port = None
+            if port is not None and port != DEFAULT_PORTS.get(scheme):
+                host += ":" + str(port)
+            path = parts.path
+
+        path = path.rstrip("/")
+        if path.endswith(".git"):
+            path = path[:-len(".git")]
+        path = path.rstrip("/")
+        if host in CASE_INSENSITIVE_HOSTS:
+            path = path.lower()
+        return scheme, host, path
+
+    def key(self, url: str) -> str:
+        """
+        Returns the scheme-independent identity of a repository URL.
+        :param url: The URL of the repository.
+        :return: The identity of the repository (e.g. github.com/ros/ros_comm).
+        """
+        scheme, host, path = self.__split(url)
+        return host + path
+
+    def canonicalize(self, url: str, vcs: str) -> str:
+        """
+        Returns the canonical URL of a repository.
+        :param url: The URL of the repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :return: The canonical URL of the repository.
+        """
+        # Follow redirects recorded in previous runs.
+        hops = 0
+        while self.key(url) in self.__redirects and hops < MAX_REDIRECT_HOPS:
+            url = self.__redirects[self.key(url)]
+            hops += 1
+
+        if self.key(url) in self.__representatives:
+            return self.__representatives[self.key(url)]
+
+        # Other hosts might not serve repositories via https (or at the same path), their URLs are kept as they are and
+        # only grouped by their identity.
+        scheme, host, path = self.__split(url)
+        if host not in HTTPS_HOSTS:
+            return url.strip()
+        if vcs == "git":
+            path += ".git"
+        return "https://" + host + path
+
+    def canonicalize_repositories(self, repositories: dict) -> None:
+        """
+        Replaces all URLs in the repository sets by their canonical URLs, and remembers the replaced URLs as aliases.
+        :param repositories: dictionary with repository-type (git, svn, hg, ...) as key and a set of URLs as value.
+        :return: None
+        """
+        for vcs, repository_set in repositories.items():
+            # Group URLs by repository identity, prefer https when choosing between different schemes. The git cloner
+            # needs the .git suffix, which is only added for hosts whose URLs are rewritten.
+            for url in sorted(repository_set, key=lambda k: (vcs == "git" and not k.rstrip("/").endswith(".git"),
+                                                             not k.startswith("https://"), k)):
+                canonical_url = self.canonicalize(url, vcs)
+                self.__representatives.setdefault(self.key(canonical_url), canonical_url)
+                self.__add_alias(self.__representatives[self.key(canonical_url)], url)
+
+            canonical_set = set(self.canonicalize(url, vcs) for url in repository_set)
+            logging.info("[RepositoryUrlCanonicalizer]: Reduced " + str(len(repository_set)) + " " + vcs
+                         + " URLs to " + str(len(canonical_set)) + " repositories.")
+            repository_set.clear()
+            repository_set.update(canonical_set)
+
+    def canonicalize_details(self, vcs: str, details: dict, repo_details: dict) -> None:
+        """
+        Adds repository details to repo_details under their canonical URL; details of a repository that has already
+        been added are skipped.
+        :param vcs: The type of the analyzed repositories (e.g. "git", "hg", "svn", ...)
+        :param details: Repository details keyed by their remote URL.
+        :param repo_details: Repository details keyed by their canonical URL.
+        :return: None
+        """
+        for url in sorted(details.keys()):
+            canonical_url = self.canonicalize(url, vcs)
+            self.__add_alias(canonical_url, url)
+            if canonical_url in repo_details:
+                logging.info("[RepositoryUrlCanonicalizer]: " + url + " has already been analyzed as "
+                             + canonical_url + ", skipping...")
+                continue
+            repo_details[canonical_url] = details[url]
+            repo_details[canonical_url]["url"] = canonical_url
+
+    def add_aliases(self, repo_details: dict) -> None:
+        """
+        Adds the list of known aliases to every repository.
+        :param repo_details: Repository details keyed by their canonical URL.
+        :return: None
+        """
+        for url, details in repo_details.items():
+            details["aliases"] = sorted(self.__aliases.get(url, set()))
+
+    def __add_alias(self, canonical_url: str, url: str) -> None:
+        """
+        Adds an alias to a canonical URL.
+        :param canonical_url: The canonical URL.
+        :param url: The alias.
+        :return: None
+        """
+        if canonical_url not in self.__aliases:
+            self.__aliases[canonical_url] = set()
+        if url != canonical_url:
+            self.__aliases[canonical_url].add(url)
+
+    def record_redirect(self, url: str, target_url: str) -> None:
+        """
+        Records that a repository has moved, future runs will use the new URL.
+        :param url: The old URL of the repository.
+        :param target_url: The URL the repository has moved to.
+        :return: None
+        """
+        if self.key(url) != self.key(target_url):
+            logging.info("[RepositoryUrlCanonicalizer]: " + url + " has moved to " + target_url)
+            self.__redirects[self.key(url)] = target_url
+
+    def save_redirects(self) -> None:
+        """
+        Saves recorded redirects to the links-folder.
+        :return: None
+        """
+        self.__write_json("redirects.json", self.__redirects)
+
+    def load_aliases(self) -> None:
+        """
+        Loads aliases saved by a previous run from the links-folder.
+        :return: None
+        """
+        for canonical_url, aliases in self.__load_json(self.__links_directory + "aliases.json").items():
+            self.__representatives.setdefault(self.key(canonical_url), canonical_url)
+            for alias in aliases:
+                self.__add_alias(canonical_url, alias)
+
+    def save_aliases(self) -> None:
+        """
+        Saves aliases to the links-folder.
+        :return: None
+        """
+        self.__write_json("aliases.json", dict((url, sorted(aliases)) for url, aliases in self.__aliases.items()))
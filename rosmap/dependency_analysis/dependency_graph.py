@@ -0,0 +1,162 @@
+from array import array
+import json
+import logging
+
+
+class DependencyGraph(object):
+    """
+    Workspace-wide package dependency graph. Package names are interned to integers and adjacency is stored in
+    compressed sparse row (CSR) arrays, i.e. the dependencies of package i are targets[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, repo_details: dict):
+        """
+        Creates a new instance of the DependencyGraph class from the packages of all analyzed repositories.
+        :param repo_details: Repository details keyed by their URL, as produced by the repository analyzers.
+        """
+        self.__names = list()
+        self.__ids = dict()
+
+        # Collect edges, packages that are declared by several repositories are merged.
+        edges = dict()
+        for url in sorted(repo_details.keys()):
+            for package in repo_details[url].get("packages", list()):
+                dependant = self.__intern(package["name"])
+                if dependant not in edges:
+                    edges[dependant] = set()
+                for dependency in package["dependencies"]:
+                    edges[dependant].add(self.__intern(dependency))
+
+        self.__offsets, self.__targets = self.__build_csr(len(self.__names), edges)
+        reverse_edges = dict()
+        for dependant, dependencies in edges.items():
+            for dependency in dependencies:
+                if dependency not in reverse_edges:
+                    reverse_edges[dependency] = set()
+                reverse_edges[dependency].add(dependant)
+        self.__reverse_offsets, self.__reverse_targets = self.__build_csr(len(self.__names), reverse_edges)
+        logging.info("[DependencyGraph]: Built graph with " + str(len(self.__names)) + " packages and "
+                     + str(len(self.__targets)) + " dependencies.")
+
+    def __intern(self, name: str) -> int:
+        """
+        Returns the integer id of a package name, assigns a new id if the name is unknown.
+        :param name: The name of the package.
+        :return: The id of the package.
+        """
+        if name not in self.__ids:
+            self.__ids[name] = len(self.__names)
+            self.__names.append(name)
+        return self.__ids[name]
+
+    @staticmethod
+    def __build_csr(node_count: int, edges: dict) -> tuple:
+        """
+        Builds CSR arrays from adjacency sets.
+        :param node_count: The amount of nodes in the graph.
+        :param edges: Adjacency sets keyed by node id.
+        :return: (offsets, targets)
+        """
+        offsets = array("l", [0])
+        targets = array("l")
+        for node in range(node_count):
+            targets.extend(sorted(edges.get(node, set())))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    @staticmethod
+    def __closure_sizes(node_count: int, offsets: array, targets: array) -> list:
+        """
+        Computes the size of the transitive closure of every node, without the node itself. Strongly connected
+        components are condensed (iterative Tarjan), closures are then propagated as bitsets in the reverse
+        topological order in which Tarjan's algorithm emits the components.
+        :param node_count: The amount of nodes in the graph.
+        :param offsets: CSR offsets.
+        :param targets: CSR targets.
+        :return: list of closure sizes indexed by node id.
+        """
+        index = array("l", [-1]) * node_count
+        lowlink = array("l", [0]) * node_count
+        on_stack = bytearray(node_count)
+        component = array("l", [-1]) * node_count
+        closures = list()
+        stack = list()
+        counter = 0
+
+        for root in range(node_count):
+            if index[root] != -1:
+                continue
+            call_stack = [(root, offsets[root])]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            while call_stack:
+                node, edge = call_stack[-1]
+                if edge < offsets[node + 1]:
+                    call_stack[-1] = (node, edge + 1)
+                    successor = targets[edge]
+                    if index[successor] == -1:
+                        index[successor] = lowlink[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = 1
+                        call_stack.append((successor, offsets[successor]))
+                    elif on_stack[successor]:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                    continue
+
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] != index[node]:
+                    continue
+
+                # Node is the root of a component, all successor components have been emitted already.
+                members = list()
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component[member] = len(closures)
+                    members.append(member)
+                    if member == node:
+                        break
+                closure = 0
+                for member in members:
+                    closure |= 1 << member
+                for member in members:
+                    for edge in range(offsets[member], offsets[member + 1]):
+                        if component[targets[edge]] != len(closures):
+                            closure |= closures[component[targets[edge]]]
+                closures.append(closure)
+
+        return [bin(closures[component[node]]).count("1") - 1 for node in range(node_count)]
+
+    def to_list(self) -> list:
+        """
+        Returns per-package statistics of the graph.
+        :return: list of dictionaries containing name, dependencies, reverse_dependencies (amount of packages that
+        directly depend on the package), transitive_dependencies and transitive_reverse_dependencies; sorted by name.
+        """
+        node_count = len(self.__names)
+        transitive_dependencies = self.__closure_sizes(node_count, self.__offsets, self.__targets)
+        transitive_reverse_dependencies = self.__closure_sizes(node_count, self.__reverse_offsets,
+                                                               self.__reverse_targets)
+        packages = list()
+        for node in sorted(range(node_count), key=lambda k: self.__names[k]):
+            packages.append({"name": self.__names[node],
+                             "dependencies": self.__offsets[node + 1] - self.__offsets[node],
+                             "reverse_dependencies": self.__reverse_offsets[node + 1] - self.__reverse_offsets[node],
+                             "transitive_dependencies": transitive_dependencies[node],
+                             "transitive_reverse_dependencies": transitive_reverse_dependencies[node]})
+        return packages
+
+    def write_to_file(self, path: str) -> None:
+        """
+        Writes per-package statistics of the graph to a file.
+        :param path: Path to the output file.
+        :return: None
+        """
+        with open(path, "w") as output_file:
+            output_file.write(json.dumps(self.to_list()))
@@ -0,0 +1,65 @@
+import logging
+
+
+class PackageProviderIndex(object):
+    """
+    Maps package names to the URL of the repository that provides them, built from the packages found in analyzed
+    repositories and the packages released in rosdistro.
+    """
+
+    def __init__(self, canonicalizer):
+        """
+        Creates a new instance of the PackageProviderIndex class.
+        :param canonicalizer: RepositoryUrlCanonicalizer used to map rosdistro URLs to the URLs of analyzed repositories.
+        """
+        self.__canonicalizer = canonicalizer
+        self.__providers = dict()
+
+    def add_rosdistro_providers(self, providers: dict, repo_details: dict) -> None:
+        """
+        Adds the providers of released packages, rosdistro entries take precedence over analyzed repositories since
+        packages may also be contained in forks.
+        :param providers: dictionary with package name as key and a list of (repository-type, url) as value.
+        :param repo_details: Repository details keyed by their canonical URL.
+        :return: None
+        """
+        for package, package_providers in providers.items():
+            urls = [self.__canonicalizer.canonicalize(url, vcs) for vcs, url in package_providers]
+            # Prefer a provider that has been analyzed, if the package moved between distributions.
+            analyzed_urls = [url for url in urls if url in repo_details]
+            self.__providers[package] = analyzed_urls[0] if analyzed_urls else urls[0]
+
+    def add_analyzed_providers(self, repo_details: dict) -> None:
+        """
+        Adds the packages found in analyzed repositories that are not released in rosdistro.
+        :param repo_details: Repository details keyed by their canonical URL.
+        :return: None
+        """
+        for url in sorted(repo_details.keys()):
+            for package in repo_details[url].get("packages", list()):
+                self.__providers.setdefault(package["name"], url)
+
+    def resolve(self, package: str) -> str:
+        """
+        Returns the URL of the repository that provides a package.
+        :param package: The name of the package.
+        :return: The URL of the providing repository, None if no provider is known.
+        """
+        return self.__providers.get(package)
+
+    def add_dependency_providers(self, repo_details: dict) -> None:
+        """
+        Adds the providing repository of each dependency to all packages.
+        :param repo_details: Repository details keyed by their canonical URL.
+        :return: None
+        """
+        unresolved = set()
+        for details in repo_details.values():
+            for package in details.get("packages", list()):
+                package["dependency_providers"] = dict()
+                for dependency in package["dependencies"]:
+                    package["dependency_providers"][dependency] = self.resolve(dependency)
+                    if package["dependency_providers"][dependency] is None:
+                        unresolved.add(dependency)
+        logging.info("[PackageProviderIndex]: Resolved providers of " + str(len(self.__providers))
+                     + " packages, " + str(len(unresolved)) + " dependencies have no known provider.")
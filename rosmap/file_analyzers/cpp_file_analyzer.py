@@ -1,29 +1,172 @@
 from .i_file_analyzer import IFileAnalyzer
+from .lint_cache import LintCache
+from ..repository_analyzers.watchdog import Watchdog
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import subprocess
+import hashlib
+import os
+import re
+
+CPPLINT_FILTER = "-whitespace/tab,-whitespace/braces,-build/headerguard,-readability/streams,-build/include_order,-whitespace/newline,-whitespace/labels,-runtime/references"
+REGEX_TOTAL_ERRORS = r'Total errors found: (\d+)'
+REGEX_ERROR_LINE = r'^(.+?):\d+:  .*  \[[^\]]+\] \[\d\]$'
+REGEX_ERROR_FILE_GROUP = 1
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_WORKERS = 1
+DEFAULT_LINT_CACHE = False
 
 
 class CppFileAnalyzer(IFileAnalyzer):
     """Analyzes C++ source and header files."""
+    def __init__(self, settings: dict):
+        super(CppFileAnalyzer, self).__init__(settings)
+        self.__batch_size = max(1, int(self._settings.get("cpplint_batch_size", DEFAULT_BATCH_SIZE)))
+        self.__workers = max(1, int(self._settings.get("cpplint_workers", DEFAULT_WORKERS)))
+        self.__executor = None
+        self.__cache = None
+        self.__pending = list()
+        self.__batches = list()
+        self.__processes = set()
+        self.__processes_lock = None
+        self.__aborted = False
+
     def initialize_fields(self, repo_detail: dict) -> None:
         try:
             repo_detail["cpplint_errors"]
         except KeyError:
             repo_detail["cpplint_errors"] = 0
+        self.__reset()
 
-    def __analyze_file(self, path: str, repo_detail: dict) -> None:
+    def __reset(self) -> None:
+        """
+        Discards the state of the previously analyzed repository.
+        :return: None
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown()
+        if self.__cache is not None:
+            self.__cache.close()
+        self.__executor = None
+        self.__cache = None
+        self.__pending = list()
+        self.__batches = list()
+        self.__processes = set()
+        self.__processes_lock = None
+        self.__aborted = False
+
+    @staticmethod
+    def __digest(path: str) -> str:
+        """
+        Computes the cache key of a file from its content and its extension (cpplint treats headers differently).
+        :param path: Path to the file.
+        :return: The digest, None if the file can not be read.
+        """
         try:
-            cpplint_report = str(subprocess.check_output(
-            "cpplint --filter=-whitespace/tab,-whitespace/braces,-build/headerguard,-readability/streams,-build/include_order,-whitespace/newline,-whitespace/labels,-runtime/references " + path,
-            shell=True, stderr=subprocess.STDOUT))
-            if "Total errors found:" in cpplint_report:
-                repo_detail["cpplint_errors"] += int(cpplint_report.split('\n')[-2].split(': ')[-1])
-        except subprocess.CalledProcessError as error:
-            cpplint_report = error.output
-            repo_detail["cpplint_errors"] += int(cpplint_report.decode("utf-8").split('\n')[-2].split(': ')[-1])
+            with open(path, "rb") as file:
+                return hashlib.sha1(file.read()).hexdigest() + os.path.splitext(path)[1]
+        except OSError:
+            return None
+
+    def __analyze_batch(self, paths: list) -> tuple:
+        """
+        Lints a batch of files with a single cpplint invocation.
+        :param paths: Paths to the files.
+        :return: (total, errors) total number of errors found in these files, and the number of errors per file (None
+        if the errors could not be attributed to the files).
+        """
+        # cpplint exits with a non-zero code if it finds errors, the report is used either way.
+        process = Watchdog.popen(["cpplint", "--filter=" + CPPLINT_FILTER] + paths, stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT)
+        with self.__processes_lock:
+            if self.__aborted:
+                Watchdog.kill(process)
+            self.__processes.add(process)
+        try:
+            with Watchdog.watch(process):
+                cpplint_report, _ = process.communicate()
+        finally:
+            with self.__processes_lock:
+                self.__processes.discard(process)
+        cpplint_report = cpplint_report.decode("utf-8", "replace")
+
+        totals = re.findall(REGEX_TOTAL_ERRORS, cpplint_report)
+        total = int(totals[-1]) if totals else 0
+
+        # Attribute errors to files.
+        errors = dict((path, 0) for path in paths)
+        for line in cpplint_report.splitlines():
+            regex_result = re.match(REGEX_ERROR_LINE, line)
+            if regex_result is not None and regex_result.group(REGEX_ERROR_FILE_GROUP) in errors:
+                errors[regex_result.group(REGEX_ERROR_FILE_GROUP)] += 1
+        if sum(errors.values()) != total:
+            return total, None
+        return total, errors
+
+    def __submit_pending(self, repo_detail: dict) -> None:
+        """
+        Lints pending files in the background, files whose content has already been linted are taken from the cache.
+        :param repo_detail: Details of the repository containing the files.
+        :return: None
+        """
+        files = self.__pending
+        self.__pending = list()
+
+        digests = dict()
+        if self.__cache is not None:
+            digests = dict((path, self.__digest(path)) for path in files)
+            cached_errors = self.__cache.get([digest for digest in digests.values() if digest is not None])
+            repo_detail["cpplint_errors"] += sum(cached_errors[digest] for digest in digests.values()
+                                                 if digest in cached_errors)
+            files = [path for path in files if digests[path] not in cached_errors]
+
+        if files:
+            self.__batches.append((self.__executor.submit(self.__analyze_batch, files), digests))
+
+    def analyze_file(self, path: str, repo_detail: dict) -> None:
+        if not (path.endswith(".hpp") or path.endswith(".cpp") or path.endswith(".h")):
+            return
+
+        # Start workers with the first C++ file of a repository, the analyzer is only picklable (for analysis jobs)
+        # while no repository is analyzed.
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__workers)
+            self.__processes_lock = threading.Lock()
+            if self._settings.get("cpplint_cache", DEFAULT_LINT_CACHE):
+                self.__cache = LintCache(self._settings["analysis_workspace"] + "cache/cpplint.sqlite",
+                                         hashlib.sha1(CPPLINT_FILTER.encode("utf-8")).hexdigest())
+
+        # Lint files in batches while the repository is still being traversed.
+        self.__pending.append(path)
+        if len(self.__pending) >= self.__batch_size:
+            self.__submit_pending(repo_detail)
 
-    def analyze_files(self, path_list: list, repo_detail: dict):
-        for file_path in filter(lambda k: k.endswith(".hpp") or k.endswith(".cpp") or k.endswith(".h"), path_list):
-            self.__analyze_file(file_path, repo_detail)
+    def abort_analysis(self) -> None:
+        if self.__executor is None:
+            return
+        # Drop queued batches and kill running ones, so the executor shuts down immediately.
+        for future, _ in self.__batches:
+            future.cancel()
+        with self.__processes_lock:
+            self.__aborted = True
+            for process in self.__processes:
+                Watchdog.kill(process)
+        self.__reset()
 
+    def finish_analysis(self, repo_detail: dict) -> None:
+        if self.__executor is None:
+            return
+        self.__submit_pending(repo_detail)
 
+        # Collect totals, they are attributed to this repository.
+        new_errors = dict()
+        for future, digests in self.__batches:
+            total, errors = future.result()
+            repo_detail["cpplint_errors"] += total
+            if errors is not None and self.__cache is not None:
+                new_errors.update((digests[path], count) for path, count in errors.items() if digests[path] is not None)
 
+        # Cache error counts of newly linted files.
+        if self.__cache is not None:
+            self.__cache.put(new_errors)
+        self.__reset()
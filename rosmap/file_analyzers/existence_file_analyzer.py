@@ -1,4 +1,19 @@
 from .i_file_analyzer import IFileAnalyzer
+import re
+
+# Rules used if the settings do not define existence_rules (key: detail, value: list of regular expressions matched
+# against the lowercase file path).
+DEFAULT_RULES = {
+    "readme": ["readme[^/]*$"],
+    "changelog": ["changelog[^/]*$"],
+    "continuous_integration": ["\\.travis\\.yml[^/]*$", "\\.gitlab-ci\\.yml[^/]*$", "bitbucket-pipelines[^/]*$"],
+    "rosinstall": ["\\.rosinstall[^/]*$"]
+}
+
+# Parts of an expression that can not match a directory separator.
+REGEX_SAFE_PARTS = r'\[\^/\]|\\\\|\\\.'
+# Parts of an expression that might match a directory separator or depend on the beginning of the path.
+REGEX_UNSAFE_PARTS = r'[/.^]|\[\^|\\[WSDwsd]'
 
 
 class ExistenceFileAnalyzer(IFileAnalyzer):
@@ -6,24 +21,85 @@ class ExistenceFileAnalyzer(IFileAnalyzer):
     Checks if files exist, and saves true or false to the repo_detail.
     """
 
-    def analyze_files(self, path_list, repo_detail: dict):
-        for path in path_list:
-            self.__analyze_file(path, repo_detail)
+    def __init__(self, settings: dict):
+        super(ExistenceFileAnalyzer, self).__init__(settings)
+        rules = self._settings.get("existence_rules", DEFAULT_RULES)
+        self.__details = sorted(rules.keys())
+
+        # Most rules only look at file names, those are matched against the file name instead of the whole path.
+        self.__file_name_rules = dict()
+        self.__path_rules = dict()
+        for index, detail in enumerate(self.__details):
+            for pattern in rules[detail]:
+                file_name_pattern = self.__to_file_name_pattern(pattern)
+                if file_name_pattern is not None:
+                    self.__file_name_rules.setdefault(index, list()).append(file_name_pattern)
+                else:
+                    self.__path_rules.setdefault(index, list()).append(pattern)
+        self.__file_name_matchers = dict((index, re.compile("|".join(patterns)))
+                                         for index, patterns in self.__file_name_rules.items())
+        self.__path_matchers = dict((index, re.compile("|".join(patterns)))
+                                    for index, patterns in self.__path_rules.items())
+
+        # Combined matchers of the rules that are not satisfied yet, keyed by these rules.
+        self.__matchers = dict()
+        self.__pending = tuple(range(len(self.__details)))
+
+    @staticmethod
+    def __to_file_name_pattern(pattern: str) -> str:
+        """
+        Converts an expression matched against the path to an equivalent expression matched against the file name.
+        :param pattern: Regular expression matched against the lowercase file path.
+        :return: Regular expression matched against the lowercase file name, None if the expression might match
+        directories (it has to be matched against the path).
+        """
+        # A leading separator anchors the expression at the start of the file name.
+        prefix = ""
+        if pattern.startswith("/"):
+            prefix = "^"
+            pattern = pattern[1:]
+        if not pattern.endswith("$") or re.search(REGEX_UNSAFE_PARTS, re.sub(REGEX_SAFE_PARTS, "", pattern)):
+            return None
+        return prefix + "(?:" + pattern + ")"
+
+    def __get_matchers(self) -> tuple:
+        """
+        Returns the combined matchers of all rules that are not satisfied yet.
+        :return: (file name matcher, path matcher), None if there are no such rules.
+        """
+        if self.__pending not in self.__matchers:
+            file_name_patterns = [pattern for index in self.__pending for pattern in self.__file_name_rules.get(index, [])]
+            path_patterns = [pattern for index in self.__pending for pattern in self.__path_rules.get(index, [])]
+            self.__matchers[self.__pending] = (re.compile("|".join(file_name_patterns)) if file_name_patterns else None,
+                                               re.compile("|".join(path_patterns)) if path_patterns else None)
+        return self.__matchers[self.__pending]
+
+    def analyze_file(self, path: str, repo_details: dict) -> None:
+        if not self.__pending:
+            return
+        path = path.lower()
+        file_name = path[path.rfind("/") + 1:]
+
+        # A single search over the file name (and one over the path for directory rules) rules out most files.
+        file_name_matcher, path_matcher = self.__get_matchers()
+        if (file_name_matcher is None or file_name_matcher.search(file_name) is None) \
+                and (path_matcher is None or path_matcher.search(path) is None):
+            return
+
+        # Find all rules matching the file.
+        for index in self.__pending:
+            if (index in self.__file_name_matchers and self.__file_name_matchers[index].search(file_name) is not None) \
+                    or (index in self.__path_matchers and self.__path_matchers[index].search(path) is not None):
+                repo_details[self.__details[index]] = True
+        self.__pending = tuple(index for index in self.__pending if not repo_details[self.__details[index]])
 
-    def __analyze_file(self, path: str, repo_details: dict) -> None:
-        file = path.split("/")[-1]
-        repo_details["readme"] = repo_details["readme"] or "readme" in file.lower()
-        repo_details["changelog"] = repo_details["changelog"] or "changelog" in file.lower()
-        repo_details["continuous_integration"] = repo_details["continuous_integration"] or \
-                                                              ".travis.yml" in file.lower() \
-                                                              or ".gitlab-ci.yml" in file.lower() \
-                                                              or "bitbucket-pipelines" in file.lower()
-        repo_details["rosinstall"] = repo_details["rosinstall"] or ".rosinstall" in file.lower()
+    def is_complete(self, repo_detail: dict) -> bool:
+        return all(repo_detail[detail] for detail in self.__details)
 
     def initialize_fields(self, repo_detail: dict) -> None:
-        details = ["readme", "changelog", "continuous_integration", "rosinstall"]
-        for detail in details:
+        for detail in self.__details:
             try:
                 repo_detail[detail]
             except KeyError:
                 repo_detail[detail] = False
+        self.__pending = tuple(index for index, detail in enumerate(self.__details) if not repo_detail[detail])
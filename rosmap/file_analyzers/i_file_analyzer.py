@@ -4,6 +4,13 @@ from abc import ABCMeta, abstractmethod
 class IFileAnalyzer(object):
     __metaclass__ = ABCMeta
 
+    def __init__(self, settings: dict):
+        """
+        Creates a new instance of a file-analyzer class.
+        :param settings: settings containing information for the plug-ins.
+        """
+        self._settings = settings
+
     @abstractmethod
     def initialize_fields(self, repo_detail: dict) -> None:
         """
@@ -13,5 +20,49 @@ class IFileAnalyzer(object):
         """
         raise NotImplementedError
 
-    def analyze_files(self, path_list, repo_detail: dict):
+    @abstractmethod
+    def analyze_file(self, path: str, repo_detail: dict) -> None:
+        """
+        Analyzes a single file, called for every file of a repository until the analyzer is complete.
+        :param path: Path to the file.
+        :param repo_detail: Details of the repository containing the file.
+        :return: None
+        """
         raise NotImplementedError
+
+    def is_complete(self, repo_detail: dict) -> bool:
+        """
+        Returns whether further files can change the result, analyzers that are complete are not fed any more files.
+        :param repo_detail: Details of the analyzed repository.
+        :return: True if the analysis of this repository is complete, False otherwise.
+        """
+        return False
+
+    def finish_analysis(self, repo_detail: dict) -> None:
+        """
+        Called after all files of a repository have been fed to the analyzer (e.g. to process pending work).
+        :param repo_detail: Details of the analyzed repository.
+        :return: None
+        """
+        pass
+
+    def abort_analysis(self) -> None:
+        """
+        Called instead of finish_analysis if the analysis of a repository has been aborted (e.g. after exceeding its
+        time budget), discards pending work.
+        :return: None
+        """
+        pass
+
+    def analyze_files(self, paths, repo_detail: dict) -> None:
+        """
+        Analyzes all files of a repository.
+        :param paths: Iterable of file paths, may be a stream.
+        :param repo_detail: Details of the repository containing the files.
+        :return: None
+        """
+        for path in paths:
+            if self.is_complete(repo_detail):
+                break
+            self.analyze_file(path, repo_detail)
+        self.finish_analysis(repo_detail)
@@ -0,0 +1,57 @@
+import sqlite3
+import os
+
+
+class LintCache(object):
+    """
+    Persistent cache mapping the content of a file (and the lint configuration) to its number of lint errors, shared by
+    all repositories and runs.
+    """
+
+    def __init__(self, path: str, configuration: str):
+        """
+        Creates a new instance of the LintCache class.
+        :param path: Path to the cache database.
+        :param configuration: Identifies the lint configuration (e.g. the cpplint filter), results of different
+        configurations are cached separately.
+        """
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self.__configuration = configuration
+        # Multiple processes may access the cache concurrently, wait for locks instead of failing.
+        self.__connection = sqlite3.connect(path, timeout=60)
+        with self.__connection:
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS lint_results "
+                                      "(digest TEXT, configuration TEXT, errors INTEGER, "
+                                      "PRIMARY KEY (digest, configuration))")
+
+    def get(self, digests: list) -> dict:
+        """
+        Looks up cached error counts.
+        :param digests: File digests to look up.
+        :return: dictionary (key: digest, value: error count) containing all cached digests.
+        """
+        results = dict()
+        for digest in set(digests):
+            row = self.__connection.execute("SELECT errors FROM lint_results WHERE digest = ? AND configuration = ?",
+                                            (digest, self.__configuration)).fetchone()
+            if row is not None:
+                results[digest] = row[0]
+        return results
+
+    def put(self, results: dict) -> None:
+        """
+        Caches error counts.
+        :param results: dictionary (key: digest, value: error count).
+        :return: None
+        """
+        with self.__connection:
+            self.__connection.executemany("INSERT OR REPLACE INTO lint_results VALUES (?, ?, ?)",
+                                          [(digest, self.__configuration, errors) for digest, errors in results.items()])
+
+    def close(self) -> None:
+        """
+        Closes the cache database.
+        :return: None
+        """
+        self.__connection.close()
@@ -0,0 +1,68 @@
+from xml.etree.cElementTree import iterparse
+from xml.etree.cElementTree import ParseError
+from io import BytesIO
+import hashlib
+
+
+class ManifestParser(object):
+    """
+    Extracts package names and dependencies from package manifests (package.xml format 1, 2 and 3, as well as rosbuild
+    manifest.xml) in a single pass, and caches results by file content.
+    """
+
+    def __init__(self, dependency_tags: list, dependency_attribute: str = None):
+        """
+        Creates a new instance of the ManifestParser class.
+        :param dependency_tags: Tags of the root element's children that declare dependencies.
+        :param dependency_attribute: Attribute that contains the dependency's name (e.g. "package" for manifest.xml),
+        the text of the tag is used if None (package.xml).
+        """
+        self.__dependency_tags = list(dependency_tags)
+        self.__dependency_attribute = dependency_attribute
+        self.__cache = dict()
+
+    def parse(self, path: str) -> tuple:
+        """
+        Parses a manifest. Conditional dependencies (format 3) are included regardless of their condition.
+        :param path: Path to the manifest.
+        :return: (name, dependencies), name is the content of the <name> tag (None if there is none), dependencies
+        are ordered by dependency tag.
+        :raises ParseError: if the manifest is not well-formed.
+        """
+        with open(path, "rb") as file:
+            content = file.read()
+
+        digest = hashlib.sha1(content).hexdigest()
+        if digest not in self.__cache:
+            self.__cache[digest] = self.__parse_content(content)
+        name, dependencies = self.__cache[digest]
+        return name, list(dependencies)
+
+    def __parse_content(self, content: bytes) -> tuple:
+        """
+        Parses the content of a manifest, only direct children of the root element are inspected.
+        :param content: The manifest's content.
+        :return: (name, dependencies)
+        """
+        name = None
+        dependencies = dict((tag, list()) for tag in self.__dependency_tags)
+        depth = 0
+        for event, element in iterparse(BytesIO(content), events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth == 1:
+                if element.tag == "name" and element.text is not None:
+                    name = element.text.strip()
+                elif element.tag in dependencies:
+                    if self.__dependency_attribute is None:
+                        dependency = element.text
+                    else:
+                        dependency = element.attrib.get(self.__dependency_attribute)
+                    if dependency is not None and dependency.strip() != "":
+                        dependencies[element.tag].append(dependency.strip())
+                element.clear()
+
+        return name, tuple(dependency for tag in self.__dependency_tags for dependency in dependencies[tag])
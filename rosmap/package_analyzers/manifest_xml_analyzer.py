@@ -1,5 +1,5 @@
 from .package_analyzer import PackageAnalyzer
-from xml.etree.cElementTree import parse
+from .manifest_parser import ManifestParser
 from xml.etree.cElementTree import ParseError
 import os
 import logging
@@ -10,6 +10,10 @@ class ManifestXmlAnalyzer(PackageAnalyzer):
     Analyzer plug-in that analyzes manifest.xml (rosbuild) package files.
     """
 
+    def __init__(self, settings):
+        super(ManifestXmlAnalyzer, self).__init__(settings)
+        self.__parser = ManifestParser(self._settings["manifest_xml_dependency_tags"], "package")
+
     def analyze_file(self, path: str, dependencies: dict) -> dict:
         """
         Analyzes a manifest.xml file.
@@ -19,23 +23,26 @@ class ManifestXmlAnalyzer(PackageAnalyzer):
         """
         # Parse xml
         try:
-            file = open(path, "r")
-            tree = parse(file)
-        except ParseError:
+            name, package_dependencies = self.__parser.parse(path)
+        except (ParseError, OSError):
             logging.warning("[ManifestXmlAnalyzer]: Could not parse " + path + "; omitting file.")
             return dependencies
 
-        element = tree.getroot()
+        # rosbuild packages are named after their directory.
         packagename = os.path.basename(os.path.dirname(path))
 
-        for tag in self._settings["manifest_xml_dependency_tags"]:
-            for element in element.findall(tag):
-                self.add_dependency(packagename, element.attrib["package"], dependencies)
+        self.add_package(packagename, dependencies)
+        for dependency in package_dependencies:
+            self.add_dependency(packagename, dependency, dependencies)
+        return dependencies
+
+    def searched_files(self) -> list:
+        return ["manifest.xml"]
 
-    def _analyze(self, path: str) -> dict:
+    def _analyze(self, path: str, file_index) -> dict:
 
         packages = dict()
-        filellist = self.search_files(path, "manifest.xml")
+        filellist = file_index.files_named("manifest.xml")
 
         for filename in filellist:
             logging.info("[ManifestXmlAnalyzer]: Analyzing " + filename)
@@ -1,5 +1,4 @@
 from abc import ABCMeta, abstractmethod
-import os
 
 
 class PackageAnalyzer(object):
@@ -15,6 +14,19 @@ class PackageAnalyzer(object):
         """
         self._settings = settings
 
+    def add_package(self, package: str, packages: dict) -> None:
+        """
+        Adds a package, regardless of whether it has dependencies.
+        :param package: The name of the package.
+        :param packages: The packages and depdendencies of this repository (key: package, value: list of dependencies).
+        :return: None
+        """
+        if not package in packages:
+            packages[package] = dict()
+        if not "dependencies" in packages[package]:
+            packages[package]["dependencies"] = list()
+        packages[package]["name"] = package
+
     def add_dependency(self, dependant: str, dependency: str, packages: dict) -> None:
         """
         Adds a dependency
@@ -31,27 +43,22 @@ class PackageAnalyzer(object):
         packages[dependant]["dependencies"].append(dependency)
 
     @abstractmethod
-    def _analyze(self, path: str) -> dict:
+    def searched_files(self) -> list:
+        """
+        Returns the names of the files analyzed by this plug-in.
+        :return: list of file names (e.g. ["package.xml"]).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def _analyze(self, path: str, file_index) -> dict:
         """
         Analyze the current path for packages (recursively)
         :param path: Path to the repository that possibly contains files.
+        :param file_index: Index of the files in the repository (see FileIndex).
         :return: Dictionary with package-names and dependencies.
         """
         raise NotImplementedError
 
-    def analyze(self, path: str) -> list:
-        return list(self._analyze(path).values())
-
-    def search_files(self, path: str, pattern: str) -> list:
-        """
-        Searches for files recursively in the file system matching the provided pattern.
-        :param path: The path to search in.
-        :param pattern: The pattern to search for.
-        :return: A list of paths to the found files.
-        """
-        filellist = []
-        for root, dirs, files in os.walk(path):
-            for name in files:
-                if name.endswith(pattern):
-                    filellist.append(os.path.join(root,str(pattern)))
-        return filellist
\ No newline at end of file
+    def analyze(self, path: str, file_index) -> list:
+        return list(self._analyze(path, file_index).values())
@@ -1,5 +1,5 @@
 from .package_analyzer import PackageAnalyzer
-from xml.etree.cElementTree import parse
+from .manifest_parser import ManifestParser
 from xml.etree.cElementTree import ParseError
 import logging
 
@@ -8,31 +8,37 @@ class PackageXmlAnalyzer(PackageAnalyzer):
     Analyzer plug-in for ROS' package.xml files (catkin).
     """
 
+    def __init__(self, settings):
+        super(PackageXmlAnalyzer, self).__init__(settings)
+        self.__parser = ManifestParser(self._settings["package_xml_dependency_tags"])
+
     def analyze_file(self, path: str, dependencies: dict) -> dict:
         # Parse xml
         try:
-            file = open(path, "r")
-            tree = parse(file)
-        except ParseError:
+            packagename, package_dependencies = self.__parser.parse(path)
+        except (ParseError, OSError):
             logging.warning("[PackageXmlAnalyzer]: Could not parse " + path + "; omitting file.")
             return dependencies
 
-        element = tree.getroot()
-        packagename = element.find('name').text
+        if packagename is None:
+            logging.warning("[PackageXmlAnalyzer]: " + path + " does not contain a package name; omitting file.")
+            return dependencies
+
+        self.add_package(packagename, dependencies)
+        for dependency in package_dependencies:
+            self.add_dependency(packagename, dependency, dependencies)
+        return dependencies
 
-        for tag in self._settings["package_xml_dependency_tags"]:
-            for element in element.findall(tag):
-                self.add_dependency(packagename, element.text, dependencies)
+    def searched_files(self) -> list:
+        return ["package.xml"]
 
-    def _analyze(self, path: str) -> dict:
+    def _analyze(self, path: str, file_index) -> dict:
 
         packages = dict()
-        filellist = self.search_files(path, "package.xml")
+        filellist = file_index.files_named("package.xml")
 
         for filename in filellist:
             logging.info("[PackageXmlAnalyzer]: Analyzing " + filename)
             self.analyze_file(filename, packages)
 
         return packages
-
-
@@ -1,6 +1,18 @@
-from repository_analyzers.offline.i_repository_analyzer import IRepositoryAnalyzer
+from .i_repository_analyzer import IRepositoryAnalyzer
+from .result_cache import ResultCache
+from .file_index import FileIndex
+from ..watchdog import Watchdog
+from ..watchdog import TimeBudgetExceeded
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 import os
+import logging
+
+DEFAULT_ANALYSIS_JOBS = 1
+DEFAULT_RESULT_CACHE = False
+DEFAULT_EXCLUDED_DIRECTORIES = []
+DEFAULT_REPOSITORY_TIME_BUDGET = 0
+DEFAULT_COMMAND_TIME_BUDGET = 0
 
 
 class AbstractRepositoryAnalyzer(IRepositoryAnalyzer):
@@ -9,26 +21,38 @@ class AbstractRepositoryAnalyzer(IRepositoryAnalyzer):
     """
     __metaclass__ = ABCMeta
 
-    def __init__(self, package_analyzers, file_analyzers):
+    def __init__(self, settings, package_analyzers, file_analyzers):
         """
         Constructor for all classes that continue to implement this class.
+        :param settings: settings containing analysis_jobs (amount of repositories analyzed in parallel),
+        analysis_result_cache (skip repositories whose revision has already been analyzed), excluded_directories
+        (names of directories that are not analyzed), repository_time_budget and command_time_budget (seconds, 0 for
+        unlimited).
         :param package_analyzers:
         :param file_analyzers:
         """
+        self._settings = settings
         self._repo_details = dict()
         self.package_analyzers = package_analyzers
         self.file_analyzers = file_analyzers
 
     @abstractmethod
-    def _analyze(self, path, repo_details) -> iter:
+    def _analyze_repository(self, repo_path: str) -> str:
         """
-        Analyzes all repositories based on their repository type, and yield returns the origin URL.
-        :param path: Path to the repositories.
-        :param repo_details: Details to the repository.
-        :return:
+        Analyzes a single repository based on its repository type, and returns its origin URL.
+        :param repo_path: Path to the repository.
+        :return: The origin URL, empty string if the path is not a valid repository.
         """
         raise NotImplementedError
 
+    def _get_revision(self, repo_path: str) -> str:
+        """
+        Returns the currently checked out revision of a repository, used as key for cached results.
+        :param repo_path: Path to the repository.
+        :return: The revision, empty string if the revision can not be determined (result will not be cached).
+        """
+        return ""
+
     def get_details(self, remote: str) -> None:
         """
         Gets the details of a repository based on its remote URL.
@@ -49,39 +73,119 @@ class AbstractRepositoryAnalyzer(IRepositoryAnalyzer):
         for file_analyzer in self.file_analyzers:
             file_analyzer.initialize_fields(self.get_details(remote))
 
-    def __process_files(self, directory: str, remote: str) -> None:
+    def __process_files(self, file_index: FileIndex, remote: str) -> None:
         """
         Analyzes all files inside a directory.
-        :param directory: Repository root directory.
+        :param file_index: Index of the files in the repository.
         :param remote: Remote
         :return: None.
         """
         self.initialize_details(remote)
+        details = self.get_details(remote)
 
-        # Build file-list.
-        filelist = list()
-        for path, subdirectory, files in os.walk(directory):
-            for name in files:
-                filelist.append(os.path.join(path, name))
+        # Stream files to all analyzers, stop feeding analyzers once they are complete.
+        active_analyzers = [file_analyzer for file_analyzer in self.file_analyzers
+                            if not file_analyzer.is_complete(details)]
+        for path in file_index:
+            Watchdog.check()
+            for file_analyzer in active_analyzers:
+                file_analyzer.analyze_file(path, details)
+                if file_analyzer.is_complete(details):
+                    active_analyzers = [analyzer for analyzer in active_analyzers if analyzer is not file_analyzer]
 
         for file_anlayzer in self.file_analyzers:
-            file_anlayzer.analyze_files(filelist, self.get_details(remote))
+            file_anlayzer.finish_analysis(details)
+
+    def _analyze_isolated(self, repo_path: str) -> tuple:
+        """
+        Performs the complete analysis of a single repository, errors do not affect the analysis of other repositories.
+        :param repo_path: Path to the repository.
+        :return: (remote, details) of the repository, remote is an empty string if the analysis failed.
+        """
+        self._repo_details = dict()
+        Watchdog.start(self._settings.get("repository_time_budget", DEFAULT_REPOSITORY_TIME_BUDGET),
+                       self._settings.get("command_time_budget", DEFAULT_COMMAND_TIME_BUDGET))
+        try:
+            remote = self._analyze_repository(repo_path)
+            if remote == "":
+                return "", dict()
+            # Traverse the repository only once for all analyzers, package files are looked up after traversal.
+            file_index = FileIndex(repo_path,
+                                   self._settings.get("excluded_directories", DEFAULT_EXCLUDED_DIRECTORIES),
+                                   [name for package_analyzer in self.package_analyzers
+                                    for name in package_analyzer.searched_files()])
+            self.__process_files(file_index, remote)
+            self.__analyze_packages(repo_path, file_index, remote)
+            return remote, self.get_details(remote)
+        except TimeBudgetExceeded as error:
+            logging.warning("[" + type(self).__name__ + "]: Aborted analysis of " + repo_path + ": " + str(error))
+            for file_analyzer in self.file_analyzers:
+                file_analyzer.abort_analysis()
+            # Keep the partial results if the remote is already known.
+            if len(self._repo_details) != 1:
+                return "", dict()
+            remote = list(self._repo_details.keys())[0]
+            self.get_details(remote)["timed_out"] = True
+            return remote, self.get_details(remote)
+        except Exception as error:
+            logging.warning("[" + type(self).__name__ + "]: Could not analyze " + repo_path + ": " + str(error))
+            return "", dict()
+        finally:
+            Watchdog.stop()
 
     def analyze_repositories(self, path: str, repo_details: dict) -> None:
-        # Add generic analysis to the tasks that are performed.
-        for repo_path, remote in self._analyze(path, repo_details):
-            self.__analyze_packages(repo_path, remote)
-            self.__process_files(repo_path, remote)
+        repo_paths = [path + "/" + folder for folder in sorted(os.listdir(path))]
+        jobs = max(1, int(self._settings.get("analysis_jobs", DEFAULT_ANALYSIS_JOBS)))
+
+        # Look up results of repositories that did not change since they were last analyzed.
+        cache = None
+        results = dict()
+        revisions = dict()
+        if self._settings.get("analysis_result_cache", DEFAULT_RESULT_CACHE):
+            cache = ResultCache(self._settings, self.package_analyzers, self.file_analyzers)
+            for repo_path in repo_paths:
+                revisions[repo_path] = self._get_revision(repo_path)
+                if revisions[repo_path] != "":
+                    cached_result = cache.get(self.analyzes(), repo_path, revisions[repo_path])
+                    if cached_result is not None:
+                        results[repo_path] = cached_result
+            logging.info("[" + type(self).__name__ + "]: Using cached results for " + str(len(results)) + " of "
+                         + str(len(repo_paths)) + " repositories.")
+        pending_paths = [repo_path for repo_path in repo_paths if repo_path not in results]
+
+        # Fan repositories out to a process pool, results are returned in the order of pending_paths.
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results.update(zip(pending_paths, executor.map(self._analyze_isolated, pending_paths)))
+        else:
+            results.update(zip(pending_paths, map(self._analyze_isolated, pending_paths)))
 
-    def __analyze_packages(self, path: str, remote: str) -> None:
+        # Cache new results, timed out analyses are retried in the next run.
+        if cache is not None:
+            for repo_path in pending_paths:
+                remote, details = results[repo_path]
+                if remote != "" and revisions[repo_path] != "" and not details.get("timed_out", False):
+                    cache.put(self.analyzes(), repo_path, revisions[repo_path], remote, details)
+            cache.save()
+
+        # Merge results in a deterministic order.
+        for repo_path in repo_paths:
+            remote, details = results[repo_path]
+            if remote == "":
+                continue
+            if remote not in repo_details:
+                repo_details[remote] = dict()
+            repo_details[remote].update(details)
+
+    def __analyze_packages(self, path: str, file_index: FileIndex, remote: str) -> None:
         """
         Analyze package-files of a repository.
         :param path: Path to root containing files to analyze.
+        :param file_index: Index of the files in the repository.
         :param remote: Remote URL of the repository containing the file.
         :return: None
         """
         for package_analyzer in self.package_analyzers:
             if "packages" not in self.get_details(remote):
                 self.get_details(remote)["packages"] = list()
-            self.get_details(remote)["packages"].extend(package_analyzer.analyze(path))
-
+            self.get_details(remote)["packages"].extend(package_analyzer.analyze(path, file_index))
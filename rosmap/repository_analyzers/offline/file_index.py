@@ -0,0 +1,61 @@
+import os
+
+# Version control metadata is never analyzed.
+VCS_DIRECTORIES = [".git", ".hg", ".svn"]
+
+
+class FileIndex(object):
+    """
+    Streams all files of a repository with a single directory traversal, shared by all analyzers. Only the paths of
+    retained file names (e.g. package manifests) are kept in memory.
+    """
+
+    def __init__(self, directory: str, excluded_directories: list, retained_names: list):
+        """
+        Creates a new instance of the FileIndex class.
+        :param directory: Repository root directory.
+        :param excluded_directories: Names of directories that are not indexed (e.g. vendored code), version control
+        metadata directories are always excluded.
+        :param retained_names: File names whose paths are kept for lookups via files_named (e.g. package.xml).
+        """
+        self.__directory = directory
+        self.__excluded_directories = set(VCS_DIRECTORIES) | set(excluded_directories)
+        self.__retained_names = set(retained_names)
+        self.__files_by_name = dict()
+        self.__indexed = False
+
+    def __iter__(self) -> iter:
+        """
+        Traverses the directory tree (without following symbolic links) and yield returns the paths of all files.
+        :return: Yield returns file paths.
+        """
+        self.__files_by_name = dict((name, list()) for name in self.__retained_names)
+        directories = [self.__directory]
+        while directories:
+            current_directory = directories.pop()
+            try:
+                entries = list(os.scandir(current_directory))
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink() and entry.name not in self.__excluded_directories:
+                        directories.append(entry.path)
+                else:
+                    if entry.name in self.__files_by_name:
+                        self.__files_by_name[entry.name].append(entry.path)
+                    yield entry.path
+        self.__indexed = True
+
+    def files_named(self, name: str) -> list:
+        """
+        Returns the paths of all files with the given file name, traverses the directory tree if that has not happened
+        yet.
+        :param name: The file name (e.g. package.xml), has to be one of the retained names.
+        :return: list of paths.
+        """
+        if not self.__indexed:
+            for _ in self:
+                pass
+        return self.__files_by_name.get(name, list())
@@ -1,8 +1,13 @@
 from .abstract_repository_analyzer import AbstractRepositoryAnalyzer
+from .history_cache import HistoryCache
+from .history_summary import HistorySummary
+from ..watchdog import Watchdog
 from git import Repo
 from git import InvalidGitRepositoryError
+from git import NoSuchPathError
+from git import GitCommandError
 import subprocess
-import os
+import hashlib
 import logging
 
 
@@ -11,59 +16,104 @@ class GitRepositoryAnalyzer(AbstractRepositoryAnalyzer):
     Analysis plug-in for Git-Repositories.
     """
 
-    def count_repo_branches(self, repo_path: str, remote: str) -> None:
+    def count_repo_branches(self, repo: Repo, remote: str) -> None:
         """
-        Counts the repository's branches.
-        :param repo_path: path to the repository root.
+        Counts the repository's local and remote branches (like "git branch -a") by reading its references in-process.
+        :param repo: the repository.
         :param remote: remote uri of the branches
         :return: None
         """
-        branches = subprocess.check_output("cd " + repo_path + ";git branch -a | wc -l", shell=True)
-        self.get_details(remote)["branch_count"] = int(branches)
+        branches = [ref for ref in repo.refs if ref.path.startswith("refs/heads/") or ref.path.startswith("refs/remotes/")]
+        self.get_details(remote)["branch_count"] = len(branches) + (1 if repo.head.is_detached else 0)
 
-    def count_repo_contributors(self, repo_path: str, remote: str) -> None:
+    def __is_ancestor(self, repo_path: str, revision: str) -> bool:
         """
-        Counts the repository's contributors.
+        Checks whether a revision is an ancestor of HEAD (i.e. HEAD has only been fast-forwarded since).
         :param repo_path: path to the repository root.
-        :param remote: remote uri of the branches
-        :return: None
+        :param revision: the revision.
+        :return: True if the revision is an ancestor of HEAD, False otherwise.
         """
-        contributors = subprocess.check_output("cd " + repo_path + ";git shortlog -s HEAD | wc -l", shell=True)
-        self.get_details(remote)["contributors"] = int(contributors)
+        try:
+            Watchdog.check_output(["git", "merge-base", "--is-ancestor", revision, "HEAD"], cwd=repo_path,
+                                  stderr=subprocess.DEVNULL)
+            return True
+        except subprocess.CalledProcessError:
+            return False
 
-    def extract_last_repo_update(self, repo_path: str, remote: str) -> None:
+    def extract_history_metrics(self, repo: Repo, remote: str) -> None:
         """
-        Extracts the repository's last update-timestamp.
-        :param repo_path: path to the repository root.
+        Extracts the repository's contributors, commits per author and month, bus factor and last update-timestamp.
+        The history summary of the previous run is extended by new commits, the whole history of HEAD is only walked
+        if there is no summary or HEAD is not a descendant of the summarized revision.
+        :param repo: the repository.
         :param remote: remote uri of the branches
         :return: None
         """
-        timestamp = subprocess.check_output("cd " + repo_path + ";git log -1 --format=%ct", shell=True)
-        self.get_details(remote)["last_update"] = int(timestamp)
+        history_cache = HistoryCache(self._settings)
+        summary = history_cache.load(self.analyzes(), repo.working_dir)
+        head = repo.head.commit.hexsha
+
+        if summary.revision != head:
+            revisions = "HEAD"
+            if summary.revision != "" and self.__is_ancestor(repo.working_dir, summary.revision):
+                revisions = summary.revision + "..HEAD"
+            else:
+                summary = HistorySummary()
+
+            # Stream author names (mailmap applied, like "git shortlog") and timestamps, newest commit first.
+            process = Watchdog.popen(["git", "log", "--format=%aN%x00%at%x00%ct", revisions], cwd=repo.working_dir,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            last_update = None
+            with Watchdog.watch(process):
+                for line in process.stdout:
+                    author, author_time, commit_time = line.rstrip(b"\n").split(b"\x00")
+                    if last_update is None:
+                        last_update = int(commit_time)
+                    summary.add_commit(author.decode("utf-8", "replace"), int(author_time))
+                process.stdout.close()
+                process.wait()
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, process.args)
+
+            # The last update is the commit time of HEAD.
+            if last_update is not None:
+                summary.last_update = last_update
+            summary.revision = head
+            history_cache.save(self.analyzes(), repo.working_dir, summary)
+
+        summary.add_details(self.get_details(remote))
+
+    def _get_revision(self, repo_path: str) -> str:
+        # The branch count depends on all references, not only on HEAD.
+        try:
+            repo = Repo(repo_path + "/")
+            branches = repo.git.for_each_ref("--format=%(refname)", "refs/heads/", "refs/remotes/")
+            branches += "\n" + str(repo.head.is_detached)
+            return repo.head.commit.hexsha + ":" + hashlib.sha1(branches.encode("utf-8")).hexdigest()
+        except (InvalidGitRepositoryError, NoSuchPathError, GitCommandError, ValueError):
+            return ""
 
-    def _analyze(self, path: str, repo_details: dict) -> iter:
-        self._repo_details = repo_details
-        for folder in os.listdir(path):
+    def _analyze_repository(self, repo_path: str) -> str:
+        # Inform user...
+        logging.info("[GitRepositoryAnalyzer]: Analyzing:" + repo_path)
 
-            # Build path and inform user...
-            current_path = path + "/" + folder + ""
-            logging.info("[GitRepositoryAnalyzer]: Analyzing:" + current_path)
+        # Check if repo is valid.
+        try:
+            repo = Repo(repo_path + "/")
+        except InvalidGitRepositoryError:
+            return ""
 
-            # Check if repo is valid.
-            try:
-                repo = Repo(path + "/" + folder + "/")
-            except InvalidGitRepositoryError:
-                continue
+        # Extract origin url.
+        origin_url = repo.remotes.origin.url
 
-            # Extract origin url.
-            origin_url = repo.remotes.origin.url
+        # Register the repository, so partial results are kept if the analysis exceeds its time budget.
+        self.get_details(origin_url)
 
-            # Git analysis.
-            self.count_repo_contributors(current_path, origin_url)
-            self.count_repo_branches(current_path, origin_url)
-            self.extract_last_repo_update(current_path, origin_url)
+        # Git analysis.
+        self.count_repo_branches(repo, origin_url)
+        self.extract_history_metrics(repo, origin_url)
 
-            yield (current_path, origin_url)
+        return origin_url
 
     def analyzes(self):
         return "git"
@@ -0,0 +1,60 @@
+from .history_summary import HistorySummary
+import json
+import os
+import logging
+
+
+class HistoryCache(object):
+    """
+    Persists the history summaries of repositories, so subsequent runs only need to summarize new commits.
+    """
+
+    def __init__(self, settings: dict):
+        """
+        Creates a new instance of the HistoryCache class.
+        :param settings: settings including analysis_workspace (path), summaries are stored in its cache/history/
+        subfolder.
+        """
+        self.__directory = settings["analysis_workspace"] + "cache/history/"
+
+    def __path(self, vcs: str, repo_path: str) -> str:
+        """
+        Returns the path of the summary of a repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :param repo_path: Path to the repository.
+        :return: Path of the summary file.
+        """
+        return self.__directory + vcs + "/" + os.path.basename(repo_path.rstrip("/")) + ".json"
+
+    def load(self, vcs: str, repo_path: str) -> HistorySummary:
+        """
+        Loads the summary of a repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :param repo_path: Path to the repository.
+        :return: The summary, an empty summary if there is none.
+        """
+        path = self.__path(vcs, repo_path)
+        if not os.path.exists(path):
+            return HistorySummary()
+        try:
+            with open(path, "r") as summary_file:
+                return HistorySummary.from_dict(json.loads(summary_file.read()))
+        except (ValueError, KeyError):
+            logging.warning("[HistoryCache]: Could not parse " + path + ", summarizing the whole history.")
+            return HistorySummary()
+
+    def save(self, vcs: str, repo_path: str, summary: HistorySummary) -> None:
+        """
+        Saves the summary of a repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :param repo_path: Path to the repository.
+        :param summary: The summary.
+        :return: None
+        """
+        path = self.__path(vcs, repo_path)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write atomically, repositories are analyzed concurrently.
+        with open(path + ".tmp", "w") as summary_file:
+            summary_file.write(json.dumps(summary.to_dict()))
+        os.replace(path + ".tmp", path)
@@ -0,0 +1,84 @@
+import time
+
+
+class HistorySummary(object):
+    """
+    Summary of the commit history of a repository up to a revision, can be extended by newer commits without walking
+    the history again.
+    """
+
+    def __init__(self, revision: str = "", author_commits: dict = None, monthly_commits: dict = None,
+                 last_update: int = None):
+        """
+        Creates a new instance of the HistorySummary class.
+        :param revision: The last summarized revision, empty string if no commit has been summarized.
+        :param author_commits: Commit counts per author.
+        :param monthly_commits: Commit counts per month (YYYY-MM, UTC).
+        :param last_update: Timestamp of the last update.
+        """
+        self.revision = revision
+        self.author_commits = dict(author_commits) if author_commits is not None else dict()
+        self.monthly_commits = dict(monthly_commits) if monthly_commits is not None else dict()
+        self.last_update = last_update
+
+    @staticmethod
+    def from_dict(summary: dict) -> "HistorySummary":
+        """
+        Creates a summary from its dictionary representation.
+        :param summary: The dictionary, as returned by to_dict.
+        :return: The summary.
+        """
+        return HistorySummary(summary["revision"], summary["author_commits"], summary["monthly_commits"],
+                              summary["last_update"])
+
+    def to_dict(self) -> dict:
+        """
+        Returns the dictionary representation of the summary.
+        :return: The dictionary.
+        """
+        return {"revision": self.revision,
+                "author_commits": self.author_commits,
+                "monthly_commits": self.monthly_commits,
+                "last_update": self.last_update}
+
+    def add_commit(self, author: str, timestamp: int) -> None:
+        """
+        Adds a commit to the summary.
+        :param author: The author of the commit.
+        :param timestamp: The timestamp of the commit.
+        :return: None
+        """
+        month = time.strftime("%Y-%m", time.gmtime(timestamp))
+        self.author_commits[author] = self.author_commits.get(author, 0) + 1
+        self.monthly_commits[month] = self.monthly_commits.get(month, 0) + 1
+        if self.last_update is None or timestamp > self.last_update:
+            self.last_update = timestamp
+
+    def bus_factor(self) -> int:
+        """
+        Estimates the bus factor: the smallest amount of authors that together authored more than half of all
+        commits.
+        :return: The bus factor, 0 if there are no commits.
+        """
+        total = sum(self.author_commits.values())
+        covered = 0
+        authors = 0
+        for commits in sorted(self.author_commits.values(), reverse=True):
+            if covered * 2 > total:
+                break
+            covered += commits
+            authors += 1
+        return authors
+
+    def add_details(self, details: dict) -> None:
+        """
+        Adds the metrics of the summary to the details of a repository.
+        :param details: Details of the repository.
+        :return: None
+        """
+        details["contributors"] = len(self.author_commits)
+        details["author_commits"] = dict(self.author_commits)
+        details["monthly_commits"] = dict(self.monthly_commits)
+        details["bus_factor"] = self.bus_factor()
+        if self.last_update is not None:
+            details["last_update"] = self.last_update
@@ -1,76 +1,117 @@
 from .abstract_repository_analyzer import AbstractRepositoryAnalyzer
-import subprocess
-import os
+from .history_cache import HistoryCache
+from .history_summary import HistorySummary
+from ..watchdog import Watchdog
+import hglib
 import logging
 
 
 class MercurialRepositoryAnalyzer(AbstractRepositoryAnalyzer):
     """
-    Analysis plug-in for mercurial repositories.
+    Analysis plug-in for mercurial repositories, uses one hglib command-server session per repository.
     """
 
-    def count_repo_branches(self, repo_path: str, remote: str) -> None:
+    def count_repo_branches(self, client: hglib.client.hgclient, remote: str) -> None:
         """
         Counts the repository's branches.
-        :param repo_path: path to the repository root.
-        :param remote: remote uri of the branches
-        :return: None
-        """
-        branches = subprocess.check_output("cd " + repo_path + ";hg branches | wc -l", shell=True)
-        self.get_details(remote)["branch_count"] = int(branches)
-
-    def count_repo_contributors(self, repo_path: str, remote: str) -> None:
-        """
-        Counts the repository's contributors.
-        :param repo_path: path to the repository root.
+        :param client: hglib session of the repository.
         :param remote: remote uri of the branches
         :return: None
         """
-        contributors = subprocess.check_output('cd ' + repo_path + ';hg log --template "{author|person}\n" | sort | uniq | wc -l', shell=True)
-        self.get_details(remote)["contributors"] = int(contributors)
+        self.get_details(remote)["branch_count"] = len(client.branches())
 
-    def extract_repo_url(self, repo_path: str) -> str:
+    def extract_repo_url(self, client: hglib.client.hgclient) -> str:
         """
-        Extracts the Remote URL from a given SVN repository-path.
-        :param repo_path: path to the repository root.
+        Extracts the Remote URL from a given mercurial repository.
+        :param client: hglib session of the repository.
         :return: Remote URL
         """
         try:
-            return subprocess.check_output("cd " + repo_path + ";hg paths default", shell=True).decode("utf-8").rstrip("\n")
-        except subprocess.CalledProcessError:
+            return client.rawcommand([b"paths", b"default"]).decode("utf-8").rstrip("\n")
+        except hglib.error.CommandError:
             return ""
 
-    def extract_last_repo_update(self, repo_path: str, remote: str) -> None:
+    def extract_history_metrics(self, client: hglib.client.hgclient, repo_path: str, remote: str) -> None:
         """
-        Extracts the repository's last update-timestamp.
+        Extracts the repository's contributors, commits per author and month, bus factor and last update-timestamp
+        from all changesets. Changesets are only appended by pulls, so the history summary of the previous run is
+        extended by the changesets after the summarized tip, unless that tip has been stripped.
+        :param client: hglib session of the repository.
         :param repo_path: path to the repository root.
         :param remote: remote uri of the branches
         :return: None
         """
-        timestamp = subprocess.check_output("cd " + repo_path + ";hg log --limit 1 --template '{date(date, \"%s\")}'", shell=True)
-        self.get_details(remote)["last_update"] = int(timestamp)
+        history_cache = HistoryCache(self._settings)
+        summary = history_cache.load(self.analyzes(), repo_path)
+        tip = client.rawcommand([b"log", b"-r", b"tip", b"--template", b"{rev}:{node}"]).decode("utf-8")
+
+        if summary.revision != tip:
+            revisions = b"0:tip"
+            if summary.revision != "":
+                revision, node = summary.revision.split(":")
+                try:
+                    if client.rawcommand([b"log", b"-r", revision.encode("utf-8"), b"--template",
+                                          b"{node}"]).decode("utf-8") == node:
+                        revisions = str(int(revision) + 1).encode("utf-8") + b":tip"
+                except hglib.error.CommandError:
+                    pass
+            if revisions == b"0:tip":
+                summary = HistorySummary()
+
+            # The repository is empty if tip is the null revision.
+            if not tip.startswith("-1:"):
+                changesets = client.rawcommand([b"log", b"-r", revisions, b"--template",
+                                                b"{date|hgdate} {author|person}\n"])
+                for line in changesets.splitlines():
+                    timestamp, offset, author = line.split(b" ", 2)
+                    summary.add_commit(author.decode("utf-8", "replace"), int(timestamp))
 
-    def _analyze(self, path: str, repo_details: dict) -> None:
-        self._repo_details = repo_details
-        for folder in os.listdir(path):
+                # The last update is the date of tip.
+                summary.last_update = int(client.rawcommand([b"log", b"-r", b"tip", b"--template",
+                                                             b"{date|hgdate}"]).split()[0])
+            summary.revision = tip
+            history_cache.save(self.analyzes(), repo_path, summary)
 
-            # Build path and inform user...
-            current_path = path + "/" + folder + ""
-            logging.info("[MercurialRepositoryAnalyzer]: Analyzing:" + current_path)
+        summary.add_details(self.get_details(remote))
 
+    def _get_revision(self, repo_path: str) -> str:
+        try:
+            with hglib.open(repo_path) as client:
+                # Files are analyzed at the working directory's parent, the history up to tip.
+                parent = client.rawcommand([b"log", b"-r", b".", b"--template", b"{node}"])
+                tip = client.rawcommand([b"log", b"-r", b"tip", b"--template", b"{rev}:{node}"])
+                return (parent + b":" + tip).decode("utf-8")
+        except (hglib.error.ServerError, hglib.error.CommandError, OSError):
+            return ""
+
+    def _analyze_repository(self, repo_path: str) -> str:
+        # Inform user...
+        logging.info("[MercurialRepositoryAnalyzer]: Analyzing:" + repo_path)
+
+        try:
+            client = hglib.open(repo_path)
+        except (hglib.error.ServerError, OSError):
+            logging.warning("[MercurialRepositoryAnalyzer]: " + repo_path + " is not a valid repository...")
+            return ""
+
+        # The command server is killed if the repository exceeds its time budget.
+        with client, Watchdog.watch(client.server):
             # Extract origin url.
-            origin_url = self.extract_repo_url(current_path)
+            origin_url = self.extract_repo_url(client)
 
             # If origin_url is empty string, then this is not a valid mercurial-repository.
-            if origin_url != "":
-                # Mercurial analysis.
-                self.count_repo_contributors(current_path, origin_url)
-                self.count_repo_branches(current_path, origin_url)
-                self.extract_last_repo_update(current_path, origin_url)
-
-                yield (current_path, origin_url)
-            else:
-                logging.warning("[MercurialRepositoryAnalyzer]: " + current_path + " is not a valid repository...")
+            if origin_url == "":
+                logging.warning("[MercurialRepositoryAnalyzer]: " + repo_path + " is not a valid repository...")
+                return ""
+
+            # Register the repository, so partial results are kept if the analysis exceeds its time budget.
+            self.get_details(origin_url)
+
+            # Mercurial analysis, all commands are run by the same command server.
+            self.extract_history_metrics(client, repo_path, origin_url)
+            self.count_repo_branches(client, origin_url)
+
+        return origin_url
 
     def analyzes(self):
         return "hg"
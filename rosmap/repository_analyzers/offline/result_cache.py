@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import logging
+
+# Increment whenever a change of the analysis changes its results, invalidates all cached results.
+ANALYZER_SET_VERSION = 5
+
+# Settings that influence the results of the analysis.
+ANALYSIS_SETTINGS = ["package_xml_dependency_tags", "manifest_xml_dependency_tags", "excluded_directories",
+                     "existence_rules"]
+
+
+class ResultCache(object):
+    """
+    Persistent cache for analysis results, keyed by the analyzed revision of each repository.
+    """
+
+    def __init__(self, settings: dict, package_analyzers: list, file_analyzers: list):
+        """
+        Creates a new instance of the ResultCache class and loads cached results.
+        :param settings: settings including analysis_workspace (path), the cache is stored in its cache/ subfolder.
+        :param package_analyzers: package analyzers used for analysis.
+        :param file_analyzers: file analyzers used for analysis.
+        """
+        self.__path = settings["analysis_workspace"] + "cache/analysis_results.json"
+        self.__version = self.__create_version(settings, package_analyzers, file_analyzers)
+        self.__entries = dict()
+        if os.path.exists(self.__path):
+            try:
+                with open(self.__path, "r") as cache_file:
+                    self.__entries = json.loads(cache_file.read())
+            except ValueError:
+                logging.warning("[ResultCache]: Could not parse " + self.__path + ", ignoring cached results.")
+
+    @staticmethod
+    def __create_version(settings: dict, package_analyzers: list, file_analyzers: list) -> str:
+        """
+        Creates a version string that identifies the set of analyzers and their configuration.
+        :return: the version string.
+        """
+        analyzer_set = [ANALYZER_SET_VERSION,
+                        sorted(type(analyzer).__name__ for analyzer in package_analyzers),
+                        sorted(type(analyzer).__name__ for analyzer in file_analyzers),
+                        [settings.get(key) for key in ANALYSIS_SETTINGS]]
+        return hashlib.sha1(json.dumps(analyzer_set, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def __key(vcs: str, repo_path: str) -> str:
+        """
+        Returns the cache key of a repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :param repo_path: Path to the repository.
+        :return: the cache key.
+        """
+        return vcs + "/" + os.path.basename(repo_path.rstrip("/"))
+
+    def get(self, vcs: str, repo_path: str, revision: str) -> tuple:
+        """
+        Returns the cached result of a repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :param repo_path: Path to the repository.
+        :param revision: The current revision of the repository.
+        :return: (remote, details) if a result for this revision and analyzer set is cached, None otherwise.
+        """
+        entry = self.__entries.get(self.__key(vcs, repo_path))
+        if entry is None or entry["revision"] != revision or entry["version"] != self.__version:
+            return None
+        return entry["remote"], entry["details"]
+
+    def put(self, vcs: str, repo_path: str, revision: str, remote: str, details: dict) -> None:
+        """
+        Caches the result of a repository.
+        :param vcs: The type of the repository (e.g. "git", "hg", "svn", ...)
+        :param repo_path: Path to the repository.
+        :param revision: The analyzed revision of the repository.
+        :param remote: The remote URL of the repository.
+        :param details: The details of the repository.
+        :return: None
+        """
+        self.__entries[self.__key(vcs, repo_path)] = {"revision": revision,
+                                                      "version": self.__version,
+                                                      "remote": remote,
+                                                      "details": details}
+
+    def save(self) -> None:
+        """
+        Writes the cache to disk.
+        :return: None
+        """
+        if not os.path.exists(os.path.dirname(self.__path)):
+            os.makedirs(os.path.dirname(self.__path))
+        with open(self.__path, "w") as cache_file:
+            cache_file.write(json.dumps(self.__entries))
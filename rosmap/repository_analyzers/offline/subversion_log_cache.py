@@ -0,0 +1,135 @@
+from xml.etree.cElementTree import iterparse
+from xml.etree.cElementTree import ParseError
+from .history_summary import HistorySummary
+from ..watchdog import Watchdog
+import subprocess
+import dateutil.parser
+import json
+import os
+import logging
+
+
+class SubversionLogCache(object):
+    """
+    Local summary of the log of subversion working copies (history summary and branch count), so metrics can be
+    computed without contacting the server. The log is fetched incrementally as streamed XML.
+    """
+
+    def __init__(self, settings: dict):
+        """
+        Creates a new instance of the SubversionLogCache class.
+        :param settings: settings including analysis_workspace (path), summaries are stored in its cache/svn/ subfolder.
+        """
+        self.__directory = settings["analysis_workspace"] + "cache/svn/"
+
+    def __path(self, repo_path: str) -> str:
+        """
+        Returns the path of the summary of a working copy.
+        :param repo_path: Path to the working copy.
+        :return: Path of the summary file.
+        """
+        return self.__directory + os.path.basename(repo_path.rstrip("/")) + ".json"
+
+    @staticmethod
+    def __get_info(repo_path: str, item: str) -> str:
+        """
+        Returns an item of svn info of a working copy, does not contact the server.
+        :param repo_path: Path to the working copy.
+        :param item: The item (e.g. revision, repos-root-url).
+        :return: The value of the item.
+        """
+        return Watchdog.check_output(["svn", "info", "--show-item=" + item], cwd=repo_path).decode("utf-8").strip()
+
+    def __load(self, repo_path: str) -> dict:
+        """
+        Loads the summary of a working copy.
+        :param repo_path: Path to the working copy.
+        :return: The summary, None if there is none.
+        """
+        if not os.path.exists(self.__path(repo_path)):
+            return None
+        try:
+            with open(self.__path(repo_path), "r") as summary_file:
+                summary = json.loads(summary_file.read())
+        except ValueError:
+            return None
+        # Summaries of older versions are summarized again.
+        if "history" not in summary:
+            return None
+        return summary
+
+    def get(self, repo_path: str) -> dict:
+        """
+        Returns the summary of a working copy if it is up to date with the checked out revision.
+        :param repo_path: Path to the working copy.
+        :return: dictionary containing revision, history (see HistorySummary.to_dict) and branch_count; None if there
+        is no summary for the checked out revision.
+        """
+        summary = self.__load(repo_path)
+        try:
+            if summary is None or summary["revision"] != int(self.__get_info(repo_path, "revision")):
+                return None
+        except (subprocess.CalledProcessError, ValueError):
+            return None
+        return summary
+
+    def update(self, repo_path: str) -> dict:
+        """
+        Fetches log entries that are missing from the summary of a working copy (up to the checked out revision) and
+        the current branch count from the server.
+        :param repo_path: Path to the working copy.
+        :return: The updated summary, None if the log could not be fetched.
+        """
+        summary = self.__load(repo_path)
+        if summary is None:
+            summary = {"revision": 0, "history": HistorySummary().to_dict(), "branch_count": 0}
+
+        try:
+            revision = int(self.__get_info(repo_path, "revision"))
+            repository_root = self.__get_info(repo_path, "repos-root-url")
+        except (subprocess.CalledProcessError, ValueError):
+            logging.warning("[SubversionLogCache]: " + repo_path + " is not a valid working copy...")
+            return None
+
+        if summary["revision"] < revision:
+            # Stream the missing part of the log, log entries are discarded once they have been summarized.
+            history = HistorySummary.from_dict(summary["history"])
+            parsed = True
+            process = Watchdog.popen(["svn", "log", "--xml", "--quiet",
+                                      "-r", str(summary["revision"] + 1) + ":" + str(revision)],
+                                     cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            try:
+                with Watchdog.watch(process):
+                    for event, element in iterparse(process.stdout, events=("end",)):
+                        if element.tag != "logentry":
+                            continue
+                        if element.findtext("author") is not None and element.findtext("date") is not None:
+                            history.add_commit(element.findtext("author"),
+                                               int(dateutil.parser.parse(element.findtext("date")).timestamp()))
+                        element.clear()
+            except ParseError:
+                parsed = False
+            finally:
+                process.stdout.close()
+            if process.wait() != 0 or not parsed:
+                logging.warning("[SubversionLogCache]: Could not fetch log of " + repo_path)
+                return None
+            history.revision = str(revision)
+            summary["history"] = history.to_dict()
+            summary["revision"] = revision
+
+        # Branches are not part of the working copy's log, the count is refreshed on every update.
+        try:
+            branches = Watchdog.check_output(["svn", "ls", repository_root + "/branches"],
+                                             stderr=subprocess.DEVNULL)
+            summary["branch_count"] = len(branches.splitlines())
+        except subprocess.CalledProcessError:
+            summary["branch_count"] = 0
+
+        # Write atomically, working copies are summarized concurrently.
+        if not os.path.exists(self.__directory):
+            os.makedirs(self.__directory, exist_ok=True)
+        with open(self.__path(repo_path) + ".tmp", "w") as summary_file:
+            summary_file.write(json.dumps(summary))
+        os.replace(self.__path(repo_path) + ".tmp", self.__path(repo_path))
+        return summary
@@ -1,11 +1,15 @@
 from .abstract_repository_analyzer import AbstractRepositoryAnalyzer
+from .subversion_log_cache import SubversionLogCache
+from .history_summary import HistorySummary
+from ..watchdog import Watchdog
 from xml.etree.cElementTree import fromstring
 from xml.etree.cElementTree import ParseError
 import subprocess
-import os
 import dateutil.parser
 import logging
 
+DEFAULT_LOCAL_METRICS = False
+
 
 class SubversionRepositoryAnalyzer(AbstractRepositoryAnalyzer):
     """
@@ -19,7 +23,7 @@ class SubversionRepositoryAnalyzer(AbstractRepositoryAnalyzer):
         :param remote: remote uri of the branches
         :return: None
         """
-        branches = subprocess.check_output("cd " + repo_path + ";svn ls $(svn info --show-item=repos-root-url)/branches | wc -l", shell=True)
+        branches = Watchdog.check_output("cd " + repo_path + ";svn ls $(svn info --show-item=repos-root-url)/branches | wc -l", shell=True)
         self.get_details(remote)["branch_count"] = int(branches)
 
     def count_repo_contributors(self, repo_path: str, remote:str) -> None:
@@ -29,7 +33,7 @@ class SubversionRepositoryAnalyzer(AbstractRepositoryAnalyzer):
         :param remote: remote uri of the branches
         :return: None
         """
-        contributors = subprocess.check_output("cd " + repo_path + ";svn log --quiet | awk '/^r/ {print $3}' | sort -u | wc -l", shell=True)
+        contributors = Watchdog.check_output("cd " + repo_path + ";svn log --quiet | awk '/^r/ {print $3}' | sort -u | wc -l", shell=True)
         self.get_details(remote)["contributors"] = int(contributors)
 
     def extract_repo_url(self, repo_path) -> str:
@@ -39,7 +43,7 @@ class SubversionRepositoryAnalyzer(AbstractRepositoryAnalyzer):
         :return: Remote URL
         """
         try:
-            return subprocess.check_output("cd " + repo_path + ";svn info --show-item=url", shell=True).decode("utf-8").rstrip("\n")
+            return Watchdog.check_output("cd " + repo_path + ";svn info --show-item=url", shell=True).decode("utf-8").rstrip("\n")
         except subprocess.CalledProcessError:
             return ""
 
@@ -51,7 +55,7 @@ class SubversionRepositoryAnalyzer(AbstractRepositoryAnalyzer):
         :return: None
         """
 
-        timestamp = subprocess.check_output("cd " + repo_path + ";svn log --limit 1 --incremental --xml --quiet", shell=True)
+        timestamp = Watchdog.check_output("cd " + repo_path + ";svn log --limit 1 --incremental --xml --quiet", shell=True)
 
         # Parse xml
         try:
@@ -67,27 +71,46 @@ class SubversionRepositoryAnalyzer(AbstractRepositoryAnalyzer):
         # Insert timestamp into details.
         self.get_details(remote)["last_update"] = int(timestamp.timestamp())
 
-    def _analyze(self, path: str, repo_details: dict) -> None:
-        self._repo_details = repo_details
-        for folder in os.listdir(path):
+    def _get_revision(self, repo_path: str) -> str:
+        try:
+            return Watchdog.check_output("cd " + repo_path + ";svn info --show-item=revision", shell=True).decode("utf-8").strip()
+        except subprocess.CalledProcessError:
+            return ""
 
-            # Build path and inform user...
-            current_path = path + "/" + folder + ""
-            logging.info("[SubversionRepositoryAnalyzer]: Analyzing:" + current_path)
+    def _analyze_repository(self, repo_path: str) -> str:
+        # Inform user...
+        logging.info("[SubversionRepositoryAnalyzer]: Analyzing:" + repo_path)
 
-            # Extract origin url.
-            origin_url = self.extract_repo_url(current_path)
+        # Extract origin url.
+        origin_url = self.extract_repo_url(repo_path)
 
-            # If origin_url is "", then this is not a valid svn-repository.
-            if origin_url != "":
-                # Subversion analysis.
-                self.count_repo_contributors(current_path, origin_url)
-                self.count_repo_branches(current_path, origin_url)
-                self.extract_last_repo_update(current_path, origin_url)
+        # If origin_url is empty string, then this is not a valid svn-repository.
+        if origin_url == "":
+            logging.warning("[SubversionRepositoryAnalyzer]: " + repo_path + " is not a valid repository...")
+            return ""
 
-                yield (current_path, origin_url)
-            else:
-                logging.warning("[SubversionRepositoryAnalyzer]: " + current_path + " is not a valid repository...")
+        # Register the repository, so partial results are kept if the analysis exceeds its time budget.
+        self.get_details(origin_url)
+
+        # Use the local log summary if possible, it is created while checking out or updating the working copy.
+        if self._settings.get("svn_local_metrics", DEFAULT_LOCAL_METRICS):
+            log_cache = SubversionLogCache(self._settings)
+            summary = log_cache.get(repo_path)
+            if summary is None:
+                summary = log_cache.update(repo_path)
+            if summary is not None:
+                HistorySummary.from_dict(summary["history"]).add_details(self.get_details(origin_url))
+                self.get_details(origin_url)["branch_count"] = summary["branch_count"]
+                return origin_url
+            logging.warning("[SubversionRepositoryAnalyzer]: No log summary for " + repo_path
+                            + ", querying the server...")
+
+        # Subversion analysis.
+        self.count_repo_contributors(repo_path, origin_url)
+        self.count_repo_branches(repo_path, origin_url)
+        self.extract_last_repo_update(repo_path, origin_url)
+
+        return origin_url
 
     def analyzes(self):
         return "svn"
\ No newline at end of file
@@ -1,7 +1,10 @@
 import dateutil
 import logging
 from .i_scs_analyzer import ISCSRepositoryAnalyzer
-from rosmap.api_bindings.bitbucket_api_bindings import BitbucketApiBindings
+from .concurrent_analysis import ConcurrentAnalysis
+from functools import partial
+from rosmap.api_bindings.bitbucket_api_bindings import BitbucketApiBindings, DEFAULT_API_URL
+from rosmap.api_bindings.http_session import HttpSession
 
 
 class BitbucketRepositoryAnalyzer(ISCSRepositoryAnalyzer):
@@ -11,9 +14,13 @@ class BitbucketRepositoryAnalyzer(ISCSRepositoryAnalyzer):
     def __init__(self, settings: dict):
         """
         Creates a new instance of the BitbucketRepositoryAnalyzer.
-        :param settings: settings containing the bitbucket_api_rate_limit (requests/hour)
+        :param settings: settings containing the bitbucket_api_rate_limit (requests/hour), bitbucket_api_url and
+        remote_analysis_concurrency
         """
-        self.__api_bindings = BitbucketApiBindings(settings["bitbucket_api_rate_limit"])
+        self.__api_bindings = BitbucketApiBindings(settings["bitbucket_api_rate_limit"],
+                                                   HttpSession.shared(settings),
+                                                   settings.get("bitbucket_api_url", DEFAULT_API_URL))
+        self.__concurrent_analysis = ConcurrentAnalysis(settings)
 
     @staticmethod
     def initialize_values(repo_details: dict) -> None:
@@ -65,12 +72,16 @@ class BitbucketRepositoryAnalyzer(ISCSRepositoryAnalyzer):
                 details["open_pull_requests"] += 1
 
     def analyze_repositories(self, repo_details: dict) -> None:
+        calls = list()
         for url, details in repo_details.items():
             if "bitbucket" in url:
                 logging.info("[BitbucketRepositoryAnalyzer]: Fetching data from " + url)
-                self.count_stargazers(url, details)
-                self.count_issues(url, details)
-                self.count_pull_requests(url, details)
+                self.initialize_values(details)
+                # The pagination chains of a repository are independent, and run concurrently.
+                calls.append((url, partial(self.count_stargazers, url, details)))
+                calls.append((url, partial(self.count_issues, url, details)))
+                calls.append((url, partial(self.count_pull_requests, url, details)))
+        self.__concurrent_analysis.run(calls)
 
     def analyzes(self):
         return "bitbucket"
\ No newline at end of file
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import logging
+
+DEFAULT_CONCURRENCY = 1
+
+
+class ConcurrentAnalysis(object):
+    """
+    Runs the blocking API calls of remote analyses (e.g. the pagination chain of a repository's issues) concurrently
+    on an asyncio event loop, so requests of many repositories are in flight at the same time. The rate limiters of
+    the API bindings are shared by all calls.
+    """
+
+    def __init__(self, settings: dict):
+        """
+        Creates a new instance of the ConcurrentAnalysis class.
+        :param settings: settings containing remote_analysis_concurrency (amount of calls in flight).
+        """
+        self.__concurrency = max(1, int(settings.get("remote_analysis_concurrency", DEFAULT_CONCURRENCY)))
+
+    @staticmethod
+    async def __run_call(loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor, name: str, call) -> None:
+        """
+        Runs a single call in the executor, errors only affect this call.
+        :param loop: The event loop.
+        :param executor: Executor that runs the blocking call.
+        :param name: Name of the call, used for logging (e.g. the repository URL).
+        :param call: The call.
+        :return: None
+        """
+        try:
+            await loop.run_in_executor(executor, call)
+        except Exception as error:
+            logging.warning("[ConcurrentAnalysis]: Could not analyze " + name + ": " + str(error))
+
+    @staticmethod
+    async def __run_calls(loop: asyncio.AbstractEventLoop, executor: ThreadPoolExecutor, calls: list) -> None:
+        """
+        Runs all calls concurrently.
+        :param loop: The event loop.
+        :param executor: Executor that runs the blocking calls.
+        :param calls: list of (name, call) tuples.
+        :return: None
+        """
+        await asyncio.gather(*[ConcurrentAnalysis.__run_call(loop, executor, name, call) for name, call in calls])
+
+    def run(self, calls: list) -> None:
+        """
+        Runs all calls and returns once every call has finished.
+        :param calls: list of (name, call) tuples, the calls must not depend on each other.
+        :return: None
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            with ThreadPoolExecutor(max_workers=self.__concurrency) as executor:
+                loop.run_until_complete(self.__run_calls(loop, executor, calls))
+        finally:
+            loop.close()
@@ -1,7 +1,19 @@
 import dateutil.parser
 import logging
 from .i_scs_analyzer import ISCSRepositoryAnalyzer
-from rosmap.api_bindings.github_api_bindings import GithubApiBindings
+from rosmap.api_bindings.github_api_bindings import GithubApiBindings, DEFAULT_API_URL
+from rosmap.api_bindings.http_session import HttpSession
+from rosmap.canonicalizers.repository_url_canonicalizer import RepositoryUrlCanonicalizer
+from .concurrent_analysis import ConcurrentAnalysis
+from functools import partial
+
+DEFAULT_BACKEND = "rest"
+
+# Amount of repositories whose statistics are fetched by a single GraphQL query.
+GRAPHQL_BATCH_SIZE = 50
+
+# Only repositories hosted on github.com can be queried with GraphQL.
+GITHUB_URL_PREFIX = "https://github.com/"
 
 
 class GithubRepositoryAnalyzer(ISCSRepositoryAnalyzer):
@@ -11,11 +23,18 @@ class GithubRepositoryAnalyzer(ISCSRepositoryAnalyzer):
     def __init__(self, settings: dict):
         """
         Creates a new instance of the GithubRepositoryAnalyzer class.
-        :param settings: settings containing github_username, github_password, and github_api_rate_limit
+        :param settings: settings containing github_username, github_password, github_api_rate_limit, github_api_url,
+        github_backend ("rest" or "graphql"), remote_analysis_concurrency and analysis_workspace
         """
+        self.__backend = settings.get("github_backend", DEFAULT_BACKEND)
         self.__api_bindings = GithubApiBindings(settings["github_username"],
                                                 settings["github_password"],
-                                                settings["github_api_rate_limit"])
+                                                settings["github_api_rate_limit"],
+                                                HttpSession.shared(settings),
+                                                settings.get("github_api_url", DEFAULT_API_URL))
+        self.__canonicalizer = RepositoryUrlCanonicalizer(settings)
+        self.__concurrent_analysis = ConcurrentAnalysis(settings)
+        self.__closed_issue_counts = dict()
 
     @staticmethod
     def initialize_values(repo_details: dict) -> None:
@@ -40,7 +59,13 @@ class GithubRepositoryAnalyzer(ISCSRepositoryAnalyzer):
         :param repo_details: details of the repository associated with the URL
         :return:
         """
-        repo_details["stars"] = self.__api_bindings.get_stargazer_count(url)
+        repository = self.__api_bindings.get_repository(url)
+        if repository is not None:
+            repo_details["stars"] = repository["stargazers_count"]
+            # Remember moved repositories, so the next run uses their new URL.
+            self.__canonicalizer.record_redirect(url, repository["clone_url"])
+        else:
+            repo_details["stars"] = -1
 
     def count_closed_issues(self, url: str, repo_details: dict) -> None:
         """
@@ -69,16 +94,94 @@ class GithubRepositoryAnalyzer(ISCSRepositoryAnalyzer):
             else:
                 repo_details["open_issues"] += 1
 
+    def count_repository_statistics(self, urls: list, repo_details: dict) -> None:
+        """
+        Counts stars, open issues, open pull requests and closed pull requests of many repositories with a single
+        GraphQL query.
+        :param urls: URLs to the repositories.
+        :param repo_details: details of all repositories, keyed by URL.
+        :return: None
+        """
+        statistics = self.__api_bindings.get_repository_statistics(urls)
+        for url in urls:
+            details = repo_details[url]
+            if statistics.get(url) is None:
+                details["stars"] = -1
+                continue
+            details["stars"] = statistics[url]["stars"]
+            details["open_issues"] = statistics[url]["open_issues"]
+            details["open_pull_requests"] = statistics[url]["open_pull_requests"]
+            details["closed_pull_requests"] = statistics[url]["closed_pull_requests"]
+            self.__closed_issue_counts[url] = statistics[url]["closed_issues"]
+            # Remember moved repositories, so the next run uses their new URL.
+            self.__canonicalizer.record_redirect(url, statistics[url]["url"])
+
+    def collect_issue_durations(self, url: str, repo_details: dict) -> None:
+        """
+        Calculates how long closed issues were open using the GraphQL API.
+        :param url: URL to the repository.
+        :param repo_details: details of the repository associated with the URL
+        :return: None
+        """
+        for issue in self.__api_bindings.get_closed_issues_graphql(url):
+            elapsed_time = dateutil.parser.parse(issue["closed_at"]) - dateutil.parser.parse(issue["created_at"])
+            repo_details["issue_durations"].append(elapsed_time.total_seconds())
+
+    @staticmethod
+    def __is_repository_url(url: str) -> bool:
+        """
+        Checks whether a URL can be queried with GraphQL, i.e. names the owner and the name of a github.com repository.
+        :param url: URL of the repository.
+        :return: True if the URL is a github.com repository URL, False otherwise.
+        """
+        if not url.startswith(GITHUB_URL_PREFIX):
+            return False
+        segments = url[len(GITHUB_URL_PREFIX):].split(".git")[0].split("/")
+        return len(segments) >= 2 and segments[0] != "" and segments[1] != ""
+
+    def __analyze_repositories_graphql(self, repo_details: dict, urls: list) -> None:
+        """
+        Analyzes repositories using the GraphQL API: counts are fetched for many repositories per query, only closed
+        issues of repositories that have any are paged.
+        :param repo_details: details of all repositories, keyed by URL.
+        :param urls: URLs of the GitHub repositories.
+        :return: None
+        """
+        # A single malformed URL would fail its whole batch.
+        for url in urls:
+            if not self.__is_repository_url(url):
+                logging.warning("[GithubRepositoryAnalyzer]: " + url + " is not a github.com repository, skipping...")
+                repo_details[url]["stars"] = -1
+        urls = [url for url in urls if self.__is_repository_url(url)]
+
+        self.__concurrent_analysis.run([("GraphQL batch", partial(self.count_repository_statistics,
+                                                                   urls[index:index + GRAPHQL_BATCH_SIZE],
+                                                                   repo_details))
+                                        for index in range(0, len(urls), GRAPHQL_BATCH_SIZE)])
+        self.__concurrent_analysis.run([(url, partial(self.collect_issue_durations, url, repo_details[url]))
+                                        for url in urls if self.__closed_issue_counts.get(url, 0) > 0])
+
     def analyze_repositories(self, repo_details: dict) -> None:
         # Iterate over all URLs and their associated detail dicts
+        urls = list()
         for url, details in repo_details.items():
             # Check if it is a GitHub URL.
             if "github" in url:
                 logging.info("[GithubRepositoryAnalyzer]: Fetching data from " + url)
                 self.initialize_values(details)
-                self.count_repo_stars(url, details)
-                self.count_closed_issues(url, details)
-                self.count_open_issues(url, details)
+                urls.append(url)
+
+        if self.__backend == "graphql":
+            self.__analyze_repositories_graphql(repo_details, urls)
+        else:
+            # The pagination chains of a repository are independent, and run concurrently.
+            calls = list()
+            for url in urls:
+                calls.append((url, partial(self.count_repo_stars, url, repo_details[url])))
+                calls.append((url, partial(self.count_closed_issues, url, repo_details[url])))
+                calls.append((url, partial(self.count_open_issues, url, repo_details[url])))
+            self.__concurrent_analysis.run(calls)
+        self.__canonicalizer.save_redirects()
 
     def analyzes(self):
         return "github"
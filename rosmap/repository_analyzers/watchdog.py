@@ -0,0 +1,156 @@
+import subprocess
+import threading
+import signal
+import time
+import os
+import logging
+
+
+class TimeBudgetExceeded(Exception):
+    """
+    Raised when the analysis of a repository or a single command exceeds its time budget.
+    """
+    pass
+
+
+class Watchdog(object):
+    """
+    Enforces time budgets during analysis: a budget for the whole repository that is currently analyzed, and a
+    budget for every command run on its behalf. Commands that exceed their budget are killed (including their child
+    processes). Each process analyzes one repository at a time, so the budget is shared by all threads of a process
+    (e.g. cpplint workers).
+    """
+    __deadline = None
+    __command_budget = None
+
+    @staticmethod
+    def start(repository_budget: float, command_budget: float) -> None:
+        """
+        Starts the budget of a repository.
+        :param repository_budget: Seconds the analysis of the repository may take, unlimited if 0 or None.
+        :param command_budget: Seconds a single command may take, unlimited if 0 or None.
+        :return: None
+        """
+        Watchdog.__deadline = time.monotonic() + repository_budget if repository_budget else None
+        Watchdog.__command_budget = command_budget if command_budget else None
+
+    @staticmethod
+    def stop() -> None:
+        """
+        Removes all budgets.
+        :return: None
+        """
+        Watchdog.__deadline = None
+        Watchdog.__command_budget = None
+
+    @staticmethod
+    def check() -> None:
+        """
+        Checks whether the repository budget is exhausted, called regularly by long running in-process work.
+        :return: None
+        :raises TimeBudgetExceeded: if the budget is exhausted.
+        """
+        if Watchdog.__deadline is not None and time.monotonic() >= Watchdog.__deadline:
+            raise TimeBudgetExceeded("repository exceeded its time budget")
+
+    @staticmethod
+    def timeout() -> float:
+        """
+        Returns the time the next command may take, the remaining repository budget or the command budget.
+        :return: Timeout in seconds, None if unlimited.
+        :raises TimeBudgetExceeded: if the repository budget is exhausted.
+        """
+        Watchdog.check()
+        timeouts = [Watchdog.__command_budget]
+        if Watchdog.__deadline is not None:
+            timeouts.append(Watchdog.__deadline - time.monotonic())
+        timeouts = [timeout for timeout in timeouts if timeout is not None]
+        return min(timeouts) if timeouts else None
+
+    @staticmethod
+    def kill(process: subprocess.Popen) -> None:
+        """
+        Kills a process, and the processes it started if it leads its own process group.
+        :param process: The process.
+        :return: None
+        """
+        try:
+            if os.getpgid(process.pid) == process.pid:
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except OSError:
+            pass
+
+    @staticmethod
+    def popen(args, **kwargs) -> subprocess.Popen:
+        """
+        Starts a command in its own process group, so the watchdog can kill it together with its child processes.
+        :param args: Arguments for subprocess.Popen.
+        :param kwargs: Keyword arguments for subprocess.Popen.
+        :return: The process, use watch() to enforce the budget.
+        :raises TimeBudgetExceeded: if the repository budget is exhausted.
+        """
+        Watchdog.check()
+        return subprocess.Popen(args, start_new_session=True, **kwargs)
+
+    @staticmethod
+    def check_output(args, **kwargs) -> bytes:
+        """
+        Runs a command and returns its output, like subprocess.check_output, within the budget.
+        :param args: Arguments for subprocess.Popen.
+        :param kwargs: Keyword arguments for subprocess.Popen.
+        :return: The output of the command.
+        :raises TimeBudgetExceeded: if the command exceeds its budget.
+        :raises subprocess.CalledProcessError: if the command fails.
+        """
+        process = Watchdog.popen(args, stdout=subprocess.PIPE, **kwargs)
+        try:
+            output, _ = process.communicate(timeout=Watchdog.timeout())
+        except subprocess.TimeoutExpired:
+            Watchdog.kill(process)
+            process.communicate()
+            raise TimeBudgetExceeded("time budget exceeded while running " + str(args))
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, args, output=output)
+        return output
+
+    @staticmethod
+    def watch(process: subprocess.Popen) -> "ProcessWatch":
+        """
+        Kills a running process (e.g. a streamed command, or a command server) once its budget is exhausted.
+        :param process: The process.
+        :return: Context manager, raises TimeBudgetExceeded on exit if the process has been killed.
+        """
+        return ProcessWatch(process, Watchdog.timeout(), Watchdog.kill)
+
+
+class ProcessWatch(object):
+    """
+    Context manager that kills a process when its timeout expires.
+    """
+
+    def __init__(self, process: subprocess.Popen, timeout: float, kill):
+        self.__process = process
+        self.__expired = threading.Event()
+        self.__timer = None
+        if timeout is not None:
+            self.__timer = threading.Timer(max(0.0, timeout), self.__expire, [kill])
+            self.__timer.daemon = True
+
+    def __expire(self, kill) -> None:
+        self.__expired.set()
+        logging.warning("[Watchdog]: Killing " + str(self.__process.args) + ", time budget exceeded.")
+        kill(self.__process)
+
+    def __enter__(self) -> "ProcessWatch":
+        if self.__timer is not None:
+            self.__timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if self.__timer is not None:
+            self.__timer.cancel()
+        if self.__expired.is_set():
+            raise TimeBudgetExceeded("time budget exceeded while running " + str(self.__process.args))
+        return False
@@ -0,0 +1,98 @@
+from .i_repository_cloner import IRepositoryCloner
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+
+DEFAULT_CLONE_WORKERS = 1
+DEFAULT_UPDATE_EXISTING = False
+
+
+class AbstractRepositoryCloner(IRepositoryCloner):
+    """
+    Abstract base class for cloners, clones the repositories of a set concurrently using a bounded worker pool.
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, settings: dict):
+        """
+        Constructor for all classes that continue to implement this class.
+        :param settings: settings including keys analysis_workspace (path), repository_folder (folder in
+        analysis_workspace), clone_workers (amount of concurrent clones) and update_existing_repositories.
+        """
+        self._settings = settings
+
+    @abstractmethod
+    def _clone_repository(self, url: str) -> bool:
+        """
+        Clones a single repository, called concurrently from the worker pool.
+        :param url: The URL of the repository to clone.
+        :return: True if the repository has been cloned, False otherwise.
+        """
+        raise NotImplementedError
+
+    def _updates_existing(self) -> bool:
+        """
+        Returns whether existing clones should be updated instead of being cloned again.
+        :return: True if existing clones should be updated, False otherwise.
+        """
+        return bool(self._settings.get("update_existing_repositories", DEFAULT_UPDATE_EXISTING))
+
+    @staticmethod
+    def _find_directory(directory: str) -> str:
+        """
+        Returns the existing directory whose name only differs in case from the given directory (URLs of hosts that
+        treat names case insensitively are lowercased, earlier clones keep their original spelling).
+        :param directory: Directory of a repository.
+        :return: The existing directory, or the given directory if there is none.
+        """
+        if os.path.exists(directory):
+            return directory
+        parent, name = os.path.split(directory.rstrip("/"))
+        try:
+            entries = sorted(os.listdir(parent))
+        except OSError:
+            return directory
+        for entry in entries:
+            if entry.lower() == name.lower():
+                return os.path.join(parent, entry)
+        return directory
+
+    def _prepare(self) -> None:
+        """
+        Prepares the workspace before any repository is cloned (e.g. creates folders).
+        :return: None
+        """
+        pass
+
+    def __clone_isolated(self, url: str) -> bool:
+        """
+        Clones a single repository, making sure an error does not affect any other clone in the pool.
+        :param url: The URL of the repository to clone.
+        :return: True if the repository has been cloned, False otherwise.
+        """
+        try:
+            return self._clone_repository(url)
+        except Exception as error:
+            logging.warning("[" + type(self).__name__ + "]: Unexpected error while cloning " + url + ": " + str(error))
+            return False
+
+    def clone_repositories(self, repository_set: set) -> None:
+        self._prepare()
+
+        workers = max(1, int(self._settings.get("clone_workers", DEFAULT_CLONE_WORKERS)))
+        failed = list()
+
+        # Clone repositories concurrently, the pool never runs more than "workers" clones at the same time.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            urls = sorted(repository_set)
+            for url, cloned in zip(urls, executor.map(self.__clone_isolated, urls)):
+                if not cloned:
+                    failed.append(url)
+
+        # Notify user.
+        logging.info("[" + type(self).__name__ + "]: Cloned or updated " + str(len(repository_set) - len(failed)) + " of "
+                     + str(len(repository_set)) + " repositories using " + str(workers) + " worker(s).")
+        if failed:
+            logging.warning("[" + type(self).__name__ + "]: Could not clone or update " + str(len(failed)) + " repositories: "
+                            + ", ".join(failed))
@@ -1,56 +1,289 @@
-from .i_repository_cloner import IRepositoryCloner
+from .abstract_repository_cloner import AbstractRepositoryCloner
 from git import Repo
 from git import GitCommandError
 import os
 import re
+import json
 import logging
+import tempfile
+import threading
 from shutil import copy
+from shutil import rmtree
 
 REGEX_REPO_NAME = '\/([^\/]+?)\/([^\/]+?)\.git'
 REGEX_REPO_USER_GROUP = 1
 REGEX_REPO_NAME_GROUP = 2
 
+# Options passed to "git clone" for each clone profile. The analyzers only need the commit history and the files of
+# HEAD, which are checked out (and therefore fetched) by every profile.
+CLONE_PROFILES = {
+    "full": {},
+    "blobless": {"filter": "blob:none"},
+    "treeless": {"filter": "tree:0"}
+}
+DEFAULT_CLONE_PROFILE = "full"
+DEFAULT_REFERENCE_MIRRORS = False
 
-class GitRepositoryCloner(IRepositoryCloner):
 
-    def __init__(self, settings: dict):
-        self.__settings = settings
+class GitRepositoryCloner(AbstractRepositoryCloner):
 
-    def clone_repositories(self, repository_set: set) -> None:
-        copy(os.path.dirname(os.path.realpath(__file__)) + "/git_askpass.py", self.__settings["analysis_workspace"])
-        os.chmod(self.__settings["analysis_workspace"] + "/git_askpass.py", 0o777)
-        os.environ['GIT_ASKPASS'] = self.__settings["analysis_workspace"] + "/git_askpass.py"
+    def _prepare(self) -> None:
+        copy(os.path.dirname(os.path.realpath(__file__)) + "/git_askpass.py", self._settings["analysis_workspace"])
+        os.chmod(self._settings["analysis_workspace"] + "/git_askpass.py", 0o777)
+        os.environ['GIT_ASKPASS'] = self._settings["analysis_workspace"] + "/git_askpass.py"
         print(os.environ['GIT_ASKPASS'])
-        os.environ['GIT_USERNAME'] = self.__settings["github_username"]
-        os.environ['GIT_PASSWORD'] = self.__settings["github_password"]
+        os.environ['GIT_USERNAME'] = self._settings["github_username"]
+        os.environ['GIT_PASSWORD'] = self._settings["github_password"]
+        # Select clone profile.
+        profile = self._settings.get("git_clone_profile", DEFAULT_CLONE_PROFILE)
+        if profile not in CLONE_PROFILES:
+            logging.warning("[GitRepositoryCloner]: Unknown clone profile " + profile + ", using " + DEFAULT_CLONE_PROFILE + "...")
+            profile = DEFAULT_CLONE_PROFILE
+        self.__clone_options = CLONE_PROFILES[profile]
         # Create folder
-        if not os.path.exists(self.__settings["analysis_workspace"] + self.__settings["repository_folder"] + "git/"):
-            os.makedirs(self.__settings["analysis_workspace"] + self.__settings["repository_folder"] + "git/")
+        if not os.path.exists(self._settings["analysis_workspace"] + self._settings["repository_folder"] + "git/"):
+            os.makedirs(self._settings["analysis_workspace"] + self._settings["repository_folder"] + "git/")
 
-        for url in repository_set:
-            # Get repo name
+        # Set up shared mirrors for fork families.
+        self.__mirror_directory = self._settings["analysis_workspace"] + self._settings["repository_folder"] + "git_mirrors/"
+        self.__uses_mirrors = self._settings.get("git_reference_mirrors", DEFAULT_REFERENCE_MIRRORS)
+        self.__mirror_index = dict()
+        self.__index_lock = threading.Lock()
+        self.__family_locks = dict()
+        self.__fetched_mirrors = set()
+        if self.__uses_mirrors:
+            if not os.path.exists(self.__mirror_directory):
+                os.makedirs(self.__mirror_directory)
+            if os.path.exists(self.__mirror_directory + "index.json"):
+                with open(self.__mirror_directory + "index.json", "r") as index_file:
+                    self.__mirror_index = json.loads(index_file.read())
 
-            regex_result = re.search(REGEX_REPO_NAME, url)
-            if regex_result is not None:
-                repo_name = regex_result.group(REGEX_REPO_NAME_GROUP)
-                user_name = regex_result.group(REGEX_REPO_USER_GROUP)
+    def _clone_repository(self, url: str) -> bool:
+        # Get repo name
+        regex_result = re.search(REGEX_REPO_NAME, url)
+        if regex_result is None:
+            return False
 
-                # Notify user
-                logging.info("[GitRepositoryCloner]: Cloning repository " + repo_name + " from " + url + "...")
+        repo_name = regex_result.group(REGEX_REPO_NAME_GROUP)
+        user_name = regex_result.group(REGEX_REPO_USER_GROUP)
 
-                # Suffix in case a repo with the same name already exists
+        # Notify user
+        logging.info("[GitRepositoryCloner]: Cloning repository " + repo_name + " from " + url + "...")
 
-                try:
-                    # Create directory.
-                    directory = self.__settings["analysis_workspace"] + self.__settings["repository_folder"] + "git/" + user_name + "_" + repo_name
-                    if not os.path.exists(directory):
-                        os.makedirs(directory)
+        # Suffix in case a repo with the same name already exists
+
+        try:
+            # Create directory.
+            directory = self._find_directory(self._settings["analysis_workspace"] + self._settings["repository_folder"]
+                                             + "git/" + user_name + "_" + repo_name)
+
+            # Fast-forward existing clones instead of cloning them again.
+            if self._updates_existing() and os.path.isdir(directory + "/.git"):
+                if self.__uses_mirrors:
+                    self.__update_mirrors(directory)
+                return self.__update_repository(directory, repo_name)
+
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+            # Borrow objects from the fork family's mirror if possible.
+            clone_options = dict(self.__clone_options)
+            reference = ""
+            if self.__uses_mirrors:
+                reference = self.__get_reference(url, repo_name)
+                if reference != "":
+                    clone_options["reference_if_able"] = reference
 
-                    # Clone into directory.
-                    Repo.clone_from(url, directory)
+            # Clone into directory.
+            Repo.clone_from(url, directory, **clone_options)
+            if reference != "":
+                self.__verify_reference(directory, url, repo_name, reference)
+            return True
 
+        except GitCommandError:
+            logging.warning("[GitRepositoryCloner]: Could not clone repository " + repo_name)
+            return False
+
+    def __update_repository(self, directory: str, repo_name: str) -> bool:
+        """
+        Fetches new commits of an existing clone and fast-forwards its checked out branch.
+        :param directory: Directory of the existing clone.
+        :param repo_name: Name of the repository.
+        :return: True if the repository has been updated, False otherwise.
+        """
+        logging.info("[GitRepositoryCloner]: Updating existing repository " + repo_name + "...")
+        try:
+            Repo(directory).remotes.origin.pull(ff_only=True, prune=True)
+            return True
+        except GitCommandError:
+            logging.warning("[GitRepositoryCloner]: Could not update repository " + repo_name)
+            return False
+
+    def __update_mirrors(self, directory: str) -> None:
+        """
+        Fetches new objects into the mirrors an existing clone borrows from, every mirror is fetched once per run.
+        :param directory: Directory of the existing clone.
+        :return: None
+        """
+        alternates_path = directory + "/.git/objects/info/alternates"
+        if not os.path.exists(alternates_path):
+            return
+        with open(alternates_path, "r") as alternates_file:
+            mirrors = [os.path.dirname(line.strip().rstrip("/")) for line in alternates_file if line.strip() != ""]
+
+        for mirror in mirrors:
+            if not os.path.realpath(mirror).startswith(os.path.realpath(self.__mirror_directory)):
+                continue
+            with self.__get_family_lock(mirror):
+                if mirror in self.__fetched_mirrors:
+                    continue
+                self.__fetched_mirrors.add(mirror)
+                logging.info("[GitRepositoryCloner]: Updating shared mirror " + os.path.basename(mirror) + "...")
+                try:
+                    # Refs are never pruned, objects borrowed by clones have to stay in the mirror.
+                    Repo(mirror).git.fetch("origin", "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
                 except GitCommandError:
-                    logging.warning("[GitRepositoryCloner]: Could not clone repository " + repo_name)
+                    logging.warning("[GitRepositoryCloner]: Could not update shared mirror " + os.path.basename(mirror))
+
+    def __verify_reference(self, directory: str, url: str, family: str, reference: str) -> None:
+        """
+        Makes sure a clone borrows objects from the mirror of its own root commit: repositories with the same name are
+        not necessarily related. Clones of other roots are detached from the family's mirror and attached to the mirror
+        of their root commit, which is created if necessary.
+        :param directory: Directory of the new clone.
+        :param url: URL of the repository.
+        :param family: Name of the repository.
+        :param reference: Path to the mirror the clone borrows objects from.
+        :return: None
+        """
+        repo = Repo(directory)
+        try:
+            root = min(repo.git.rev_list("--max-parents=0", "HEAD").split())
+        except (GitCommandError, ValueError):
+            return
+        if reference == self.__mirror_directory + root + ".git":
+            return
+
+        logging.info("[GitRepositoryCloner]: " + url + " is not related to mirror " + os.path.basename(reference)
+                     + ", moving it to the mirror of its root commit...")
+        alternates_path = directory + "/.git/objects/info/alternates"
+        try:
+            # Copy borrowed objects into the clone before detaching it from the mirror.
+            repo.git.repack("-a", "-d")
+            os.remove(alternates_path)
+
+            mirror = self.__get_mirror(url, family.lower(), root, directory)
+            if mirror != "":
+                with open(alternates_path, "w") as alternates_file:
+                    alternates_file.write(os.path.realpath(mirror) + "/objects\n")
+                repo.git.repack("-a", "-d", "-l")
+        except (GitCommandError, OSError):
+            logging.warning("[GitRepositoryCloner]: Could not move " + url + " to the mirror of its root commit")
+
+    def __get_mirror(self, url: str, family: str, root: str, directory: str) -> str:
+        """
+        Returns the mirror of a root commit and records it for the fork family, creates it from a local clone if it
+        does not exist yet.
+        :param url: URL of a repository with this root commit.
+        :param family: Name of the fork family.
+        :param root: The root commit.
+        :param directory: Directory of a clone of the repository, which does not borrow objects from any mirror.
+        :return: Path to the mirror, empty string if the mirror could not be created.
+        """
+        with self.__get_family_lock(family):
+            mirror = self.__mirror_directory + root + ".git"
+            if os.path.isdir(mirror):
+                self.__record_mirror(family, root)
+                return mirror
+            return self.__create_mirror(url, family, directory)
+
+    def __get_family_lock(self, family: str) -> threading.Lock:
+        """
+        Returns the lock guarding the creation of a fork family's mirror.
+        :param family: Name of the fork family.
+        :return: The lock of the fork family.
+        """
+        with self.__index_lock:
+            if family not in self.__family_locks:
+                self.__family_locks[family] = threading.Lock()
+            return self.__family_locks[family]
+
+    def __get_reference(self, url: str, repo_name: str) -> str:
+        """
+        Returns the mirror shared by a repository's fork family (forks usually keep the repository name), and creates
+        it if the family does not have a mirror yet.
+        :param url: URL of the repository.
+        :param repo_name: Name of the repository.
+        :return: Path to the mirror, empty string if there is no mirror.
+        """
+        family = repo_name.lower()
+        with self.__get_family_lock(family):
+            with self.__index_lock:
+                roots = list(self.__mirror_index.get(family, []))
+            for root in roots:
+                if os.path.isdir(self.__mirror_directory + root + ".git"):
+                    return self.__mirror_directory + root + ".git"
+            return self.__create_mirror(url, family)
+
+    def __create_mirror(self, url: str, family: str, directory: str = None) -> str:
+        """
+        Creates a bare mirror of a repository, named after its root commit so unrelated repositories with the same
+        name do not share a mirror.
+        :param url: URL of the repository.
+        :param family: Name of the fork family.
+        :param directory: Directory of an existing clone of the repository to create the mirror from (objects are
+        hard-linked instead of being downloaded again), None to download the repository.
+        :return: Path to the mirror, empty string if the mirror could not be created.
+        """
+        logging.info("[GitRepositoryCloner]: Creating shared mirror for " + family + " from "
+                     + (url if directory is None else directory) + "...")
+        temporary_directory = tempfile.mkdtemp(prefix="tmp_", dir=self.__mirror_directory)
+        try:
+            if directory is None:
+                Repo.clone_from(url, temporary_directory, bare=True, **self.__clone_options)
+            else:
+                mirror_repo = Repo.clone_from(directory, temporary_directory, bare=True)
+                mirror_repo.git.remote("set-url", "origin", url)
+                # Objects missing from partial clones are fetched from the repository's URL.
+                source_config = Repo(directory).git.config("--get-regexp", "^remote\\.origin\\.", with_exceptions=False)
+                for line in source_config.splitlines():
+                    option, value = line.split(" ", 1)
+                    if option in ["remote.origin.promisor", "remote.origin.partialclonefilter"]:
+                        mirror_repo.git.config(option, value)
+            root = min(Repo(temporary_directory).git.rev_list("--max-parents=0", "HEAD").split())
+        except (GitCommandError, ValueError):
+            logging.warning("[GitRepositoryCloner]: Could not create shared mirror for " + family)
+            rmtree(temporary_directory, ignore_errors=True)
+            return ""
+
+        # Objects of clones are never garbage collected from their mirror.
+        Repo(temporary_directory).git.config("gc.auto", "0")
+
+        mirror = self.__mirror_directory + root + ".git"
+        with self.__index_lock:
+            # Another family might already have created a mirror for this root commit.
+            if os.path.isdir(mirror):
+                rmtree(temporary_directory, ignore_errors=True)
+            else:
+                os.rename(temporary_directory, mirror)
+        self.__record_mirror(family, root)
+        return mirror
+
+    def __record_mirror(self, family: str, root: str) -> None:
+        """
+        Records the mirror of a root commit in the index of a fork family.
+        :param family: Name of the fork family.
+        :param root: The root commit.
+        :return: None
+        """
+        with self.__index_lock:
+            if family not in self.__mirror_index:
+                self.__mirror_index[family] = list()
+            if root in self.__mirror_index[family]:
+                return
+            self.__mirror_index[family].append(root)
+            with open(self.__mirror_directory + "index.json", "w") as index_file:
+                index_file.write(json.dumps(self.__mirror_index, indent=2, sort_keys=True))
 
     def clones(self) -> str:
         return "git"
@@ -1,4 +1,4 @@
-from .i_repository_cloner import IRepositoryCloner
+from .abstract_repository_cloner import AbstractRepositoryCloner
 import hglib
 import os
 import re
@@ -9,45 +9,48 @@ REGEX_REPO_NAME = '\/([^/]+)\/*$'
 REGEX_REPO_NAME_GROUP = 1
 
 
-class MercurialRepositoryCloner(IRepositoryCloner):
+class MercurialRepositoryCloner(AbstractRepositoryCloner):
     """
     Clones mercurial-repositories.
     """
-    def __init__(self, settings: dict):
-        """
-        Creates a new instance of the MercurialRepositoryCloner class.
-        :param settings: settings including keys analysis_workspace (path) and repository_folder (folder in
-        analysis_workspace)
-        """
-        self.__settings = settings
-
-    def clone_repositories(self, repository_set: set) -> None:
-        # Get path to mercurial repositories.
-        directory = self.__settings["analysis_workspace"] + self.__settings["repository_folder"] + "hg/"
 
+    def _prepare(self) -> None:
         # Create path for mercurial repositories.
+        directory = self._settings["analysis_workspace"] + self._settings["repository_folder"] + "hg/"
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        # Iterate over every url and clone repositories.
-        for url in repository_set:
-            # Get repo name
-            regex_result = re.search(REGEX_REPO_NAME, url)
-            repo_name = regex_result.group(REGEX_REPO_NAME_GROUP)
-
-            # Notify user.
-            logging.info("[MercurialRepositoryCloner]: Cloning repository " + repo_name + " from " + url + "...")
-
-            try:
-                # Create repo directory.
-                repo_directory = directory + repo_name
-                if not os.path.exists(repo_directory):
-                    os.makedirs(repo_directory)
-
-                # Clone repository.
-                hglib.clone(url, repo_directory)
-            except hglib.error.CommandError:
-                logging.warning("[MercurialRepositoryCloner]: Could not clone repository " + repo_name)
+    def _clone_repository(self, url: str) -> bool:
+        # Get path to mercurial repositories.
+        directory = self._settings["analysis_workspace"] + self._settings["repository_folder"] + "hg/"
+
+        # Get repo name
+        regex_result = re.search(REGEX_REPO_NAME, url)
+        repo_name = regex_result.group(REGEX_REPO_NAME_GROUP)
+
+        # Notify user.
+        logging.info("[MercurialRepositoryCloner]: Cloning repository " + repo_name + " from " + url + "...")
+
+        try:
+            repo_directory = self._find_directory(directory + repo_name)
+
+            # Pull and update existing clones instead of cloning them again.
+            if self._updates_existing() and os.path.isdir(repo_directory + "/.hg"):
+                logging.info("[MercurialRepositoryCloner]: Updating existing repository " + repo_name + "...")
+                with hglib.open(repo_directory) as client:
+                    client.pull(update=True)
+                return True
+
+            # Create repo directory.
+            if not os.path.exists(repo_directory):
+                os.makedirs(repo_directory)
+
+            # Clone repository.
+            hglib.clone(url, repo_directory)
+            return True
+        except hglib.error.CommandError:
+            logging.warning("[MercurialRepositoryCloner]: Could not clone or update repository " + repo_name)
+            return False
 
     def clones(self) -> str:
         return "hg"
@@ -1,55 +1,74 @@
-from .i_repository_cloner import IRepositoryCloner
+from .abstract_repository_cloner import AbstractRepositoryCloner
+from ..repository_analyzers.offline.subversion_log_cache import SubversionLogCache
 import os
+import svn.local
 import svn.remote
 import svn.exception
 import urllib3
+from rosmap.api_bindings.http_session import HttpSession
 import logging
 
+DEFAULT_LOCAL_METRICS = False
+PROBE_TIMEOUT = 2
 
-class SubversionRepositoryCloner(IRepositoryCloner):
 
-    def __init__(self, settings: dict):
-        """
-        Creates a new instance of the SubversionRepositoryCloner-class.
-        :param settings: settings including keys analysis_workspace (path) and repository_folder (folder in
-        analysis_workspace)
-        """
-        self.__settings = settings
+class SubversionRepositoryCloner(AbstractRepositoryCloner):
 
-    def clone_repositories(self, repository_set: set) -> None:
+    def _prepare(self) -> None:
         # Create folder
-        directory = self.__settings["analysis_workspace"] + self.__settings["repository_folder"] + "svn/"
+        directory = self._settings["analysis_workspace"] + self._settings["repository_folder"] + "svn/"
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        for url in repository_set:
-            # Generate folder-name
-            repo_name = url.replace("/", "_")
-
-            # Notify user.
-            logging.info("[SubversionRepositoryCloner]: Cloning repository " + repo_name + " from " + url + "...")
-
-            repo_directory = directory + repo_name
-            http = urllib3.PoolManager()
-
-            try:
-                # Make sure server and path still exist.
-                status = http.request('GET', url, timeout=2).status
-                if status == 200:
-                    try:
-                        # Create repo directory.
-                        if not os.path.exists(repo_directory):
-                            os.makedirs(repo_directory)
-
-                        # Check out SVN repository.
-                        svn.remote.RemoteClient(url).checkout(repo_directory)
-                    except svn.exception.SvnException:
-                        logging.warning("[SubversionRepositoryCloner]: Could not clone from " + url)
-                else:
-                    logging.warning("[SubversionRepositoryCloner]: Could not clone from "
-                                 + url + ", server responded with " + str(status))
-            except urllib3.exceptions.MaxRetryError:
-                logging.warning("[SubversionRepositoryCloner]: Could not reach " + url + ", connection timeout...")
+    def __update_log_cache(self, repo_directory: str) -> None:
+        """
+        Fetches the log of a working copy into the local log summary, so analysis does not need to contact the server.
+        :param repo_directory: Path to the working copy.
+        :return: None
+        """
+        if self._settings.get("svn_local_metrics", DEFAULT_LOCAL_METRICS):
+            SubversionLogCache(self._settings).update(repo_directory)
+
+    def _clone_repository(self, url: str) -> bool:
+        directory = self._settings["analysis_workspace"] + self._settings["repository_folder"] + "svn/"
+
+        # Generate folder-name
+        repo_name = url.replace("/", "_")
+
+        # Notify user.
+        logging.info("[SubversionRepositoryCloner]: Cloning repository " + repo_name + " from " + url + "...")
+
+        repo_directory = directory + repo_name
+
+        try:
+            # Make sure server and path still exist, directory listings are not cached.
+            status = HttpSession.shared(self._settings).request('GET', url, timeout=PROBE_TIMEOUT,
+                                                                cacheable=False).status
+            if status == 200:
+                try:
+                    # Update existing working copies instead of checking them out again.
+                    if self._updates_existing() and os.path.isdir(repo_directory + "/.svn"):
+                        logging.info("[SubversionRepositoryCloner]: Updating existing repository " + repo_name + "...")
+                        svn.local.LocalClient(repo_directory).update()
+                        self.__update_log_cache(repo_directory)
+                        return True
+
+                    # Create repo directory.
+                    if not os.path.exists(repo_directory):
+                        os.makedirs(repo_directory)
+
+                    # Check out SVN repository.
+                    svn.remote.RemoteClient(url).checkout(repo_directory)
+                    self.__update_log_cache(repo_directory)
+                    return True
+                except svn.exception.SvnException:
+                    logging.warning("[SubversionRepositoryCloner]: Could not check out or update from " + url)
+            else:
+                logging.warning("[SubversionRepositoryCloner]: Could not clone from "
+                             + url + ", server responded with " + str(status))
+        except urllib3.exceptions.MaxRetryError:
+            logging.warning("[SubversionRepositoryCloner]: Could not reach " + url + ", connection timeout...")
+        return False
 
     def clones(self) -> str:
         return "svn"
@@ -1,4 +1,5 @@
-from rosmap.api_bindings.github_api_bindings import GithubApiBindings
+from rosmap.api_bindings.github_api_bindings import GithubApiBindings, DEFAULT_API_URL
+from rosmap.api_bindings.http_session import HttpSession
 from .i_repository_parser import IRepositoryParser
 
 
@@ -14,7 +15,9 @@ class GithubRepositoryParser(IRepositoryParser):
         """
         self.__api_bindings = GithubApiBindings(settings["github_username"],
                                                 settings["github_password"],
-                                                settings["github_search_rate_limit"])
+                                                settings["github_search_rate_limit"],
+                                                HttpSession.shared(settings),
+                                                settings.get("github_api_url", DEFAULT_API_URL))
         self.__settings = settings
 
     def parse_repositories(self, repository_dict: dict) -> None:
@@ -80,4 +80,56 @@ class RosdistroRepositoryParser(IRepositoryParser):
             logging.info("Parsing distribution " + index_yaml["distributions"][distribution]["distribution"][0])
             self.__get_urls_from_file(self.__settings["rosdistro_workspace"]
                                       + index_yaml["distributions"][distribution]["distribution"][0],
-                                      repository_dict)
\ No newline at end of file
+                                      repository_dict)
+
+    def __get_providers_from_file(self, file_path: str, providers: dict) -> None:
+        """
+        Gets the repositories providing each released package from a distribution.yaml that adheres to rosdistro-specs.
+        :param file_path: path to a distribution.yaml file
+        :param providers: dictionary with package name as key and a list of (repository-type, url) as value
+        :return: None
+        """
+        with open(file_path, "r") as file:
+            rosdistro = yaml.safe_load(file)
+
+        for repository, entry in rosdistro["repositories"].items():
+            # Prefer the source URL, as that is the URL cloned and analyzed, fall back to the doc URL.
+            provider = None
+            for section in ["source", "doc"]:
+                if section in entry and "type" in entry[section] and "url" in entry[section]:
+                    provider = (str(entry[section]["type"]), str(entry[section]["url"]))
+                    break
+            if provider is None:
+                continue
+
+            # Only released packages have providers, a release without an explicit package list releases a single
+            # package named like the repository.
+            if "release" not in entry:
+                continue
+            packages = entry["release"].get("packages", [repository])
+            for package in packages:
+                if package not in providers:
+                    providers[package] = list()
+                if provider not in providers[package]:
+                    providers[package].append(provider)
+
+    def parse_package_providers(self) -> dict:
+        """
+        Gets the repositories providing each released package from the rosdistro repository in rosdistro_workspace,
+        the repository is not updated.
+        :return: dictionary with package name as key and a list of (repository-type, url) as value, in order of the
+        distributions in index.yaml.
+        """
+        providers = dict()
+        index_path = self.__settings["rosdistro_workspace"] + "index.yaml"
+        if not os.path.exists(index_path):
+            logging.warning("[RosdistroRepositoryParser]: " + index_path + " does not exist, no package providers.")
+            return providers
+
+        with open(index_path, "r") as index_file:
+            index_yaml = yaml.safe_load(index_file)
+
+        for distribution in index_yaml["distributions"]:
+            for distribution_file in index_yaml["distributions"][distribution]["distribution"]:
+                self.__get_providers_from_file(self.__settings["rosdistro_workspace"] + distribution_file, providers)
+        return providers